@@ -72,10 +72,13 @@ def run_map_command(args, verbose=False):
         if verbose:
             print(f"Loading execution DAG from {args.execution_dag}")
         
-        # Load execution DAG
-        dag_path = Path(args.execution_dag)
-        if not dag_path.exists():
-            raise FileNotFoundError(f"Execution DAG file not found: {dag_path}")
+        # Load execution DAG (a path, or an in-memory graph when called from Python)
+        if isinstance(args.execution_dag, (str, Path)):
+            dag_path = Path(args.execution_dag)
+            if not dag_path.exists():
+                raise FileNotFoundError(f"Execution DAG file not found: {dag_path}")
+        else:
+            dag_path = args.execution_dag
         
         # Load optimization hints if present
         hints = {}
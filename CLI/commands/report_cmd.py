@@ -17,6 +17,8 @@ except ImportError:
     print("Error: C++ module not found. Please run './build_cpp.sh' first.", file=sys.stderr)
     sys.exit(1)
 
+from Scheduler.mapping.hw_config import load_json_file
+
 
 def run_report_command(args, verbose=False):
     """
@@ -35,8 +37,7 @@ def run_report_command(args, verbose=False):
         if not schedule_path.exists():
             raise FileNotFoundError(f"Schedule file not found: {schedule_path}")
         
-        with schedule_path.open('r') as f:
-            schedule_data = json.load(f)
+        schedule_data = load_json_file(schedule_path)
         
         if verbose:
             print(f"   Loaded schedule data")
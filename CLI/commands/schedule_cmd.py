@@ -18,7 +18,7 @@ except ImportError:
     print("Error: C++ scheduling module not found. Please run './build_cpp.sh' first.", file=sys.stderr)
     sys.exit(1)
 
-from Scheduler.mapping.hw_config import load_hw_config
+from Scheduler.mapping.hw_config import load_hw_config, load_hw_config_json, load_json_file
 
 
 def create_hardware_module_configs(hw_config_path: str) -> dict:
@@ -45,9 +45,7 @@ def create_hardware_module_configs(hw_config_path: str) -> dict:
     accel_name = (hw_config.accelerator_name or "ICARUS").upper()
     # Prefer technology node from config if available; fallback by accelerator name
     try:
-        import json as _json
-        with open(hw_config_path, 'r') as _f:
-            _cfg = _json.load(_f)
+        _cfg = load_hw_config_json(hw_config_path)
         tech_nm = int((_cfg.get('system_specifications', {}) or {}).get('technology_node_nm', 28))
         tech_node = f"tn{tech_nm}rvt9t"
     except Exception:
@@ -86,9 +84,7 @@ def create_hardware_module_configs(hw_config_path: str) -> dict:
 
     # Also include SRAM blocks if declared in the hardware config JSON
     try:
-        import json as _json
-        with open(hw_config_path, 'r') as _f:
-            _cfg = _json.load(_f)
+        _cfg = load_hw_config_json(hw_config_path)
         for blk in _cfg.get('sram_blocks', []) or []:
             name = str(blk.get('name', 'UNNAMED'))
             size_val = blk.get('size_kb', 0)
@@ -132,8 +128,7 @@ def run_schedule_command(args, verbose=False):
             raise FileNotFoundError(f"Mapped IR file not found: {mapped_ir_path}")
         
         t_load0 = time.time()
-        with mapped_ir_path.open('r') as f:
-            data = json.load(f)
+        data = load_json_file(mapped_ir_path)
         t_load1 = time.time()
         if verbose:
             print(f"   Mapped IR JSON load time: {t_load1 - t_load0:.2f}s")
@@ -183,8 +178,7 @@ def run_schedule_command(args, verbose=False):
                 print("   Reusing operator scheduling by signature (--reuse-op-cache)")
             # Build simple signature map from mapped_ir JSON
             try:
-                with mapped_ir_path.open('r') as _f:
-                    _mapped = json.load(_f)
+                _mapped = data
                 nodes_json = (_mapped.get('mapped_ir', {}) or {}).get('nodes', {})
                 # signature -> list of node ids
                 sig_to_ids = {}
@@ -375,9 +369,7 @@ def run_schedule_command(args, verbose=False):
             mem_bw_gbps = None
             freq_mhz = 1000.0
             if hardware_config_path and Path(hardware_config_path).exists():
-                import json as _json
-                with open(hardware_config_path, 'r') as _f:
-                    _hw = _json.load(_f)
+                _hw = load_hw_config_json(hardware_config_path)
                 freq_mhz = float(_hw.get('system_specifications', {}).get('target_frequency_mhz', 1000.0))
                 mem_bw_gbps = _hw.get('memory_hierarchy', {}).get('main_memory', {}).get('bandwidth_gbps', None)
                 # Optional SRAM IO modeling parameters (system-level)
@@ -600,9 +592,7 @@ def run_schedule_command(args, verbose=False):
         tech_nm = None
         try:
             if hardware_config_path and Path(hardware_config_path).exists():
-                import json as _json
-                with open(hardware_config_path, 'r') as _f:
-                    _hw = _json.load(_f)
+                _hw = load_hw_config_json(hardware_config_path)
                 sys_spec = _hw.get('system_specifications', {}) or {}
                 freq_mhz = float(sys_spec.get('target_frequency_mhz', 1000.0))
                 tech_nm = sys_spec.get('technology_node_nm', None)
@@ -674,9 +664,7 @@ def run_schedule_command(args, verbose=False):
         sram_dynamic_uw = 0.0
         try:
             if hardware_config_path and Path(hardware_config_path).exists():
-                import json as _json
-                with open(hardware_config_path, 'r') as _f:
-                    _hw2 = _json.load(_f)
+                _hw2 = load_hw_config_json(hardware_config_path)
                 for blk in (_hw2.get('sram_blocks', []) or []):
                     # Use explicit fields when provided in config
                     a = blk.get('area_um2', None)
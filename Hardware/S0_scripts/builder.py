@@ -19,6 +19,7 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -91,6 +92,23 @@ def tee(cmd: str, logfile: Path, timeout: int, label: str, step: str):
         lg.write(f"[RET {proc.returncode}]\n")
         return proc.returncode, out
 
+def discard_dir(path: Path):
+    """Move a directory out of the way and delete it in the background"""
+    trash = path.with_name(f"{path.name}.trash.{os.getpid()}.{time.time_ns()}")
+    os.rename(path, trash)
+    t = threading.Thread(target=shutil.rmtree, args=(trash,),
+                         kwargs={"ignore_errors": True}, daemon=True)
+    t.start()
+    return t
+
+def reap_trash(flow: str, pending=()):
+    """Wait for background deletes, then sweep this process's leftover *.trash.<pid>.* dirs"""
+    for t in pending:
+        t.join()
+    # Other builders may share OUT_DIR; their trash dirs can still be in use
+    for trash in OUT_DIR[flow].glob(f"*/*/{BUILD_NAME[flow]}.trash.{os.getpid()}.*"):
+        shutil.rmtree(trash, ignore_errors=True)
+
 def log_fail(label: str, step: str, msg: str):
     """Record failure message to failed.log"""
     tail = "\n".join(msg.splitlines()[-5:])
@@ -117,15 +135,18 @@ def parse_report(txt: str):
             break
     return m
 
-def one_step(flow: str, env: str, log: Path, label: str):
+def one_step(flow: str, env: str, log: Path, label: str, pending=None):
     """Run clean / build / report for a single module and measure time"""
 
-    # Only remove the old build directory for the corresponding flow
+    # Only remove the old build directory for the corresponding flow;
+    # it is renamed away and deleted off the critical path
     try:
         stage, mod = label.split("/")
         build_dir = OUT_DIR[flow] / stage / mod / BUILD_NAME[flow]
         if build_dir.exists():
-            shutil.rmtree(build_dir)
+            t = discard_dir(build_dir)
+            if pending is not None:
+                pending.append(t)
     except Exception:
         pass
 
@@ -192,6 +213,7 @@ def run(flow: str):
     FAILED_LOG.write_text("")
 
     build_log = SCRIPT_DIR / f"{name}_{flow}.log"
+    pending = []
 
     with PPA_LOG.open('a') as fres:
         for proj in accels:
@@ -225,13 +247,15 @@ def run(flow: str):
                 label = f"{stage}/{mod}"
                 print(f"\n========== {label} : {flow.upper()} ==========")
 
-                result = one_step(flow, env, build_log, label)
+                result = one_step(flow, env, build_log, label, pending)
                 if result:
                     fres.write(
                         f"{label} " +   # <--- Write stage/module at head
                         ' '.join(f"{k}:{v}" for k, v in result.items()) + "\n"
                     )
 
+    reap_trash(flow, pending)
+
 # Default to HLS; for FC / PWR use run_fc.py / run_pwr.py externally
 if __name__ == '__main__':
     run('hls')
@@ -25,7 +25,7 @@ import pickle
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 import concurrent.futures
 from datetime import datetime
 
@@ -81,6 +81,11 @@ class BenchmarkResult:
     error_message: Optional[str] = None
 
 
+# All BenchmarkResult fields are plain values, so a shallow per-row dict is
+# enough for JSON export (avoids the recursive deep copy done by asdict)
+_RESULT_FIELDS = [f.name for f in fields(BenchmarkResult)]
+
+
 class NeuralRenderingBenchmarker:
     """Main benchmarking orchestrator"""
     
@@ -88,6 +93,11 @@ class NeuralRenderingBenchmarker:
         self.config = config
         self.results: List[BenchmarkResult] = []
         
+        # Trace/DAG collection depends only on (pipeline, dataset, image_index),
+        # so it is shared by every accelerator benchmarked on that combination
+        self._trace_cache: Dict[Tuple[str, str, int], Tuple[str, str, float]] = {}
+        self._trace_errors: Dict[Tuple[str, str, int], Exception] = {}
+        
         # Setup directories
         self.setup_directories()
         
@@ -179,6 +189,33 @@ class NeuralRenderingBenchmarker:
         collection_time = time.time() - start_time
         return str(trace_file), str(dag_file), collection_time
     
+    def get_execution_trace(self, pipeline: str, dataset: str, image_index: int) -> Tuple[str, str, float]:
+        """Return the (memoized) execution trace for a pipeline/dataset/image triple"""
+        key = (pipeline, dataset, image_index)
+        if key in self._trace_errors:
+            raise self._trace_errors[key]
+        if key not in self._trace_cache:
+            try:
+                self._trace_cache[key] = self.collect_execution_trace(pipeline, dataset, image_index)
+            except Exception as e:
+                self._trace_errors[key] = e
+                raise
+        return self._trace_cache[key]
+    
+    def run_logged_command(self, cmd: List[str], log_file: str, step: str, tail_lines: int = 50):
+        """Run a CLI step with stdout/stderr streamed to a log file.
+
+        Output is only read back (last ``tail_lines`` lines) when the step fails,
+        so successful runs never buffer the command output in memory.
+        """
+        with open(log_file, 'wb') as lf:
+            result = subprocess.run(cmd, stdout=lf, stderr=subprocess.STDOUT, check=False)
+        
+        if result.returncode != 0:
+            with open(log_file, 'r', errors='replace') as lf:
+                tail = ''.join(lf.readlines()[-tail_lines:])
+            raise RuntimeError(f"{step} failed (see {log_file}):\n{tail}")
+    
     def run_scheduling_pipeline(self, dag_file: str, accelerator: str, output_prefix: str) -> Tuple[str, str, str, float]:
         """Run the complete scheduling pipeline (map -> schedule -> report)"""
         start_time = time.time()
@@ -196,9 +233,7 @@ class NeuralRenderingBenchmarker:
         ]
         
         print(f"🗺️  Mapping operators to {accelerator}...")
-        result = subprocess.run(map_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Mapping failed: {result.stderr}")
+        self.run_logged_command(map_cmd, f"{output_prefix}.map.log", "Mapping")
         
         # Step 2: Scheduling  
         schedule_cmd = [
@@ -208,9 +243,7 @@ class NeuralRenderingBenchmarker:
         ]
         
         print(f"⏰ Scheduling execution...")
-        result = subprocess.run(schedule_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Scheduling failed: {result.stderr}")
+        self.run_logged_command(schedule_cmd, f"{output_prefix}.schedule.log", "Scheduling")
         
         # Step 3: Report Generation
         report_cmd = [
@@ -220,9 +253,7 @@ class NeuralRenderingBenchmarker:
         ]
         
         print(f"📋 Generating PPA report...")
-        result = subprocess.run(report_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Report generation failed: {result.stderr}")
+        self.run_logged_command(report_cmd, f"{output_prefix}.report.log", "Report generation")
         
         scheduling_time = time.time() - start_time
         return mapped_file, scheduled_file, report_file, scheduling_time
@@ -281,7 +312,7 @@ class NeuralRenderingBenchmarker:
             print(f"\n🔄 Benchmarking: {pipeline} on {accelerator} ({dataset}, img{image_index})")
             
             # Step 1: Collect execution trace
-            trace_file, dag_file, collection_time = self.collect_execution_trace(
+            trace_file, dag_file, collection_time = self.get_execution_trace(
                 pipeline, dataset, image_index
             )
             result.trace_file = trace_file
@@ -319,12 +350,23 @@ class NeuralRenderingBenchmarker:
         print(f"\n🎯 Starting RenderSim Benchmark Suite")
         print(f"   Total configurations: {len(self.config.pipelines) * len(self.config.accelerators) * len(self.config.datasets) * len(self.config.image_indices)}")
         
-        # Collect all benchmark tasks
+        # Phase A: collect each unique (pipeline, dataset, image) trace once
+        traces = [(pipeline, dataset, image_index)
+                  for pipeline in dict.fromkeys(self.config.pipelines)
+                  for dataset in dict.fromkeys(self.config.datasets)
+                  for image_index in dict.fromkeys(self.config.image_indices)]
+        for trace_key in traces:
+            try:
+                self.get_execution_trace(*trace_key)
+            except Exception as e:
+                print(f"❌ Trace collection failed: {'/'.join(map(str, trace_key))} - {e}")
+        
+        # Phase B: schedule every accelerator against the cached traces
         tasks = []
-        for pipeline in self.config.pipelines:
-            for accelerator in self.config.accelerators:
-                for dataset in self.config.datasets:
-                    for image_index in self.config.image_indices:
+        for pipeline in dict.fromkeys(self.config.pipelines):
+            for accelerator in dict.fromkeys(self.config.accelerators):
+                for dataset in dict.fromkeys(self.config.datasets):
+                    for image_index in dict.fromkeys(self.config.image_indices):
                         tasks.append((pipeline, accelerator, dataset, image_index))
         
         # Execute benchmarks (sequential for now, can be parallelized)
@@ -346,7 +388,7 @@ class NeuralRenderingBenchmarker:
         # Save raw results
         results_file = self.dirs['reports'] / 'benchmark_results.json'
         with open(results_file, 'w') as f:
-            json.dump([asdict(r) for r in self.results], f, indent=2)
+            json.dump([{name: getattr(r, name) for name in _RESULT_FIELDS} for r in self.results], f, indent=2)
         
         # Generate summary statistics
         self.generate_summary_report()
@@ -36,13 +36,19 @@ matplotlib.
 from __future__ import annotations
 
 import argparse
-import pickle
+import contextlib
+import functools
+import io
+import os
+import re
+import shutil
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 import networkx as nx
-import matplotlib.pyplot as plt
 
 # -----------------------------------------------------------------------------
 # Import RenderSim – assumes `build/` with pybind11 bindings is on PYTHONPATH
@@ -53,7 +59,10 @@ sys.path.append(str(RENDERSIM_ROOT))  # Make `CLI` importable
 sys.path.append(str(RENDERSIM_ROOT / "CLI"))  # for 'commands' sub-package
 sys.path.append(str(RENDERSIM_ROOT / "build" / "Scheduler" / "cpp"))  # C++ extension module
 
-from CLI import main as cli_main  # RenderSim CLI entry-point (Python function)
+# CLI command entry-points are imported once and invoked in-process so the
+# timings do not include interpreter start-up and CLI import overhead.
+from CLI.commands.map_cmd import run_map_command
+from CLI.commands.schedule_cmd import run_schedule_command
 
 # -----------------------------------------------------------------------------
 # Synthetic operator-graph generation helpers --------------------------------------------------
@@ -61,20 +70,32 @@ from CLI import main as cli_main  # RenderSim CLI entry-point (Python function)
 # Default chunk size (can be overridden at runtime via --chunk)
 CHUNK = 8192  # points / rays / Gaussians per operator-node
 
-def _add_linear_chain(dag: nx.DiGraph, prefix: str, n: int, stages: list[str]):
-    """Helper: create `n` parallel chains stage0→stage1→… for the given *stages*."""
-    for i in range(n):
-        last = None
-        for stage in stages:
-            node = f"{prefix}_{stage}_{i}"
-            dag.add_node(node, op_type=stage.upper())
-            if last is not None:
-                dag.add_edge(last, node)
-            last = node
-
-
+def _add_linear_chain(dag: nx.DiGraph, prefix: str, n: int, stages: list[str]) -> dict[str, list[str]]:
+    """Helper: create `n` parallel chains stage0→stage1→… for the given *stages*.
+
+    Returns the node names per stage so callers can wire extra edges without
+    re-formatting them.  Names stay strings because the DAG loaders derive the
+    operator's function name from the node id.
+    """
+    # Each node name is formatted exactly once and shared by the node and edge lists
+    names = {stage: [f"{prefix}_{stage}_{i}" for i in range(n)] for stage in stages}
+    # One interned op-type string per stage, shared by every node of that stage
+    op_types = {stage: sys.intern(stage.upper()) for stage in stages}
+    dag.add_nodes_from(
+        (names[stage][i], {"op_type": op_types[stage]}) for i in range(n) for stage in stages
+    )
+    for src, dst in zip(stages, stages[1:]):
+        dag.add_edges_from(zip(names[src], names[dst]))
+    return names
+
+
+@functools.lru_cache(maxsize=None)
 def build_operator_graph(pipeline: str) -> nx.DiGraph:
-    """Return a realistic operator DAG for *pipeline* (800×800 @ Lego)."""
+    """Return a realistic operator DAG for *pipeline* (800×800 @ Lego).
+
+    Results are memoized per pipeline (several accelerators share one workload),
+    so the returned graph is shared and must not be mutated by callers.
+    """
 
     dag = nx.DiGraph()
 
@@ -86,17 +107,15 @@ def build_operator_graph(pipeline: str) -> nx.DiGraph:
         nf = fine_pts   // CHUNK             # 10 000 nodes
 
         # Coarse pass chains: Sampling→Encoding→Field→Blend
-        _add_linear_chain(dag, "coarse", nc, ["sampling", "encoding", "field", "blending"])
+        coarse = _add_linear_chain(dag, "coarse", nc, ["sampling", "encoding", "field", "blending"])
 
         # Aggregator node that waits for all coarse blends – approximates coarse-to-fine dependency
         dag.add_node("coarse_done", op_type="BARRIER")
-        for i in range(nc):
-            dag.add_edge(f"coarse_blending_{i}", "coarse_done")
+        dag.add_edges_from((name, "coarse_done") for name in coarse["blending"])
 
         # Fine pass chains start after barrier
-        _add_linear_chain(dag, "fine", nf, ["sampling", "encoding", "field", "blending"])
-        for i in range(nf):
-            dag.add_edge("coarse_done", f"fine_sampling_{i}")
+        fine = _add_linear_chain(dag, "fine", nf, ["sampling", "encoding", "field", "blending"])
+        dag.add_edges_from(("coarse_done", name) for name in fine["sampling"])
 
     elif pipeline == "instant-ngp":
         # Same total 192 samples per ray but single pass → 122 880 000 pts
@@ -107,11 +126,10 @@ def build_operator_graph(pipeline: str) -> nx.DiGraph:
     elif pipeline == "gaussian-splatting":
         # One projection/sort + one node per 16×16 screen tile (50×50 = 2 500 tiles)
         tiles = (800 // 16) * (800 // 16)     # 2500
+        tile_nodes = [f"tile_render_{t}" for t in range(tiles)]
         dag.add_node("proj_sort", op_type="ENCODING")
-        for t in range(tiles):
-            node = f"tile_render_{t}"
-            dag.add_node(node, op_type="BLENDING")
-            dag.add_edge("proj_sort", node)
+        dag.add_nodes_from(tile_nodes, op_type="BLENDING")
+        dag.add_edges_from(("proj_sort", node) for node in tile_nodes)
 
     else:
         raise ValueError(f"Unknown pipeline: {pipeline}")
@@ -122,68 +140,121 @@ def build_operator_graph(pipeline: str) -> nx.DiGraph:
 # Measurement helpers
 # -----------------------------------------------------------------------------
 
-def time_cli_command(args: List[str]) -> float:
-     """Run RenderSim CLI with *args* in a subprocess and return duration in µs."""
-     import subprocess, sys
-     start = time.perf_counter()
-     result = subprocess.run([sys.executable, "CLI/main.py", *args], capture_output=True, text=True)
-     end = time.perf_counter()
-     if result.returncode != 0:
-         print(result.stderr)
-         raise RuntimeError(f"CLI command failed: {' '.join(args)}")
-     return (end - start) * 1e6  # microseconds
+def time_cli_command(command: Callable[..., int], **kwargs) -> int:
+    """Run a RenderSim CLI *command* in-process and return its duration in ns.
+
+    *kwargs* become the attributes of the argparse namespace the command expects.
+    The command's console output is captured, so terminal writes are neither
+    timed nor mixed into the results table.  Durations stay integer
+    nanoseconds; convert to µs only when reporting.
+    """
+    args = argparse.Namespace(**kwargs)
+    err = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err):
+        start = time.perf_counter_ns()
+        rc = command(args, verbose=False)
+        end = time.perf_counter_ns()
+    if rc:
+        raise RuntimeError(f"CLI command failed: {command.__name__}({kwargs}): {err.getvalue()}")
+    return end - start
+
+
+def _scratch_root() -> Path:
+    """Create a private scratch directory for this run's intermediate JSON files.
+
+    Prefers tmpfs (/dev/shm) so the per-combo writes never touch disk.  The
+    caller owns the directory and must remove it when done.
+    """
+    shm = "/dev/shm"
+    parent = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+    return Path(tempfile.mkdtemp(prefix="rendersim_sim_speed_", dir=parent))
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_dir(tmp_root: Path) -> Path:
+    """One scratch directory per process under *tmp_root*, reused (and overwritten) by every combo."""
+    tmp_dir = tmp_root / f"worker_{os.getpid()}"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    return tmp_dir
+
+
+_STAGE_TIMER_RE = re.compile(rb'"(operator_sched_us|system_sched_us)":\s*([-+0-9.eE]+)')
+
+
+def _read_stage_timers(sched_file: Path, tail_bytes: int = 4096) -> tuple[float, float]:
+    """Return (operator_sched_us, system_sched_us) recorded in *sched_file*.
+
+    The schedule command writes its ``metadata`` block last, so only the file
+    tail is scanned; the full JSON is parsed only if the tail does not match.
+    """
+    with sched_file.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - tail_bytes))
+        timers = {key.decode(): float(val) for key, val in _STAGE_TIMER_RE.findall(f.read())}
+
+    if len(timers) < 2:
+        import json
+        with sched_file.open() as f:
+            metadata = json.load(f).get("metadata", {})
+        timers = {k: metadata.get(k) for k in ("operator_sched_us", "system_sched_us")}
+        if None in timers.values():
+            raise RuntimeError(f"Stage timers missing from schedule metadata: {sched_file}")
+
+    return timers["operator_sched_us"], timers["system_sched_us"]
 
 
 def run_micro_benchmark(tmp_dir: Path, dag: nx.DiGraph, accelerator: str) -> Dict[str, float]:
-    """Run mapping + scheduling for *dag* on *accelerator*."""
-    tmp_dir.mkdir(parents=True, exist_ok=True)
+    """Run mapping + scheduling for *dag* on *accelerator* (*tmp_dir* must exist)."""
 
-    dag_file = tmp_dir / "dag.pkl"
     mapped_file = tmp_dir / "mapped.json"
     sched_file = tmp_dir / "scheduled.json"
 
-    # Serialize operator DAG
-    with dag_file.open("wb") as f:
-        pickle.dump(dag, f)
-
     hw_config = f"examples/hardware_configs/{accelerator.lower()}_config.json"
 
-    # Mapping stage
-    map_time = time_cli_command([
-        "map", str(dag_file), hw_config, "--output", str(mapped_file)
-    ])
-
-    # Operator-level + system-level scheduling in two separate calls so we can
-    # measure them independently.  (The CLI `schedule` command internally
-    # performs both stages and records stage-wise latency – we parse it from
-    # stdout.)  For simplicity we time the whole scheduling call once and then
-    # rely on RenderSim’s built-in stage timers printed to stdout as JSON.
-    
-    sched_start = time.perf_counter()
-    time_cli_command(["schedule", str(mapped_file), "--output", str(sched_file)])
-    sched_total = (time.perf_counter() - sched_start) * 1e6  # total µs
-
-    # The schedule JSON contains per-stage latency summary (added by
-    # PerformanceTimer).  Extract it so we can separate operator vs system stage.
-    import json
-    with sched_file.open() as f:
-        sched_json = json.load(f)
-
-    op_sched_time = sched_json.get("metadata", {}).get("operator_sched_us", None)
-    sys_sched_time = sched_json.get("metadata", {}).get("system_sched_us", None)
-
-    # Fallback: if not present assume 50/50 split
-    if op_sched_time is None or sys_sched_time is None:
-        op_sched_time = sched_total * 0.5
-        sys_sched_time = sched_total * 0.5
+    # Mapping stage – the DAG is handed over in memory (no pickle round-trip),
+    # so the timer covers mapping rather than serialization
+    map_ns = time_cli_command(
+        run_map_command,
+        execution_dag=dag, hardware_config=hw_config, output=str(mapped_file),
+    )
+
+    # Operator-level + system-level scheduling.  The CLI `schedule` command
+    # performs both stages and records stage-wise latency with the C++
+    # PerformanceTimer; those numbers are reported as-is (a missing timer is an
+    # error rather than being guessed from the wall-clock duration).
+    time_cli_command(
+        run_schedule_command,
+        mapped_ir=str(mapped_file), output=str(sched_file),
+    )
+    op_sched_time, sys_sched_time = _read_stage_timers(sched_file)
 
     return {
         "num_ops": dag.number_of_nodes(),
-        "mapping_us": map_time,
+        "mapping_us": map_ns / 1e3,
         "op_sched_us": op_sched_time,
         "sys_sched_us": sys_sched_time,
     }
 
+def _warm_up(tmp_root: Path) -> None:
+    """Run map + schedule once on a tiny DAG so first-call costs (lazy imports,
+    C++ module initialisation) are not charged to the first timed combo."""
+    dag = nx.DiGraph()
+    _add_linear_chain(dag, "warmup", 4, ["sampling", "encoding", "field", "blending"])
+    try:
+        run_micro_benchmark(_worker_dir(tmp_root), dag, "icarus")
+    except Exception as e:  # warm-up is best effort; real failures surface in the timed runs
+        print(f"⚠️  Warm-up run failed: {e}")
+
+
+def _one_combo(pipe: str, acc: str, tmp_root: Path, chunk: int) -> Dict[str, float]:
+    """Build the DAG for *pipe* and benchmark it on *acc* (process-pool worker)."""
+    global CHUNK
+    if CHUNK != chunk:  # spawned workers do not inherit the --chunk override
+        CHUNK = chunk
+        build_operator_graph.cache_clear()
+    dag = build_operator_graph(pipe)
+    return run_micro_benchmark(_worker_dir(tmp_root), dag, acc)
+
 # -----------------------------------------------------------------------------
 # Main entry-point
 # -----------------------------------------------------------------------------
@@ -194,12 +265,19 @@ def main():
     parser.add_argument("--output", type=str, default="simulation_speed_results.csv", help="CSV output file")
     parser.add_argument("--chunk", type=int, default=CHUNK,
                         help="Points per operator node (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Benchmark combos in this many parallel processes; values > 1 "
+                             "finish sooner but the timings then contend for CPU "
+                             "(default: %(default)s)")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Skip the bar plot (avoids importing matplotlib)")
     args = parser.parse_args()
 
     # ------------------------------------------------------------------
     # Allow user to override global CHUNK size
     # ------------------------------------------------------------------
     CHUNK = max(1, args.chunk)
+    build_operator_graph.cache_clear()  # cached graphs depend on CHUNK
     print(f"🔧 Using CHUNK size = {CHUNK} points per operator node")
 
     # Only the 4 validated accelerator/algorithm combos requested by the user
@@ -210,19 +288,35 @@ def main():
         ("gaussian-splatting", "gscore"),   # GSCore ← 3-D Gaussian Splatting
     ]
 
-    tmp_root = Path(".tmp_sim_speed")
+    tmp_root = _scratch_root()
     results: List[Dict[str, str | float]] = []
 
-    for pipe, acc in combos:
-        dag = build_operator_graph(pipe)
-        print(f"\n🏎️  Running {pipe} on {acc}…")
-        metrics = run_micro_benchmark(tmp_root / f"{pipe}_{acc}", dag, acc)
+    # Combos are independent (own tmp dir and hw config), so they can run in
+    # separate processes; results are still reported in combo order.
+    try:
+        if args.jobs > 1:
+            print(f"\n🏎️  Running {len(combos)} combos on {args.jobs} worker processes…")
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=_warm_up,
+                                     initargs=(tmp_root,)) as ex:
+                futures = [ex.submit(_one_combo, pipe, acc, tmp_root, CHUNK) for pipe, acc in combos]
+                all_metrics = [f.result() for f in futures]
+        else:
+            _warm_up(tmp_root)
+            all_metrics = []
+            for pipe, acc in combos:
+                print(f"\n🏎️  Running {pipe} on {acc}…")
+                all_metrics.append(_one_combo(pipe, acc, tmp_root, CHUNK))
+    finally:
+        # The pool has shut down by now, so no worker still writes here
+        shutil.rmtree(tmp_root, ignore_errors=True)
+
+    for (pipe, acc), metrics in zip(combos, all_metrics):
         results.append({
             "pipeline": pipe,
             "accelerator": acc,
             **metrics,
         })
-        print(f"   ➡️  {metrics['num_ops']} ops | map {metrics['mapping_us']:.1f} µs | "
+        print(f"   ➡️  {pipe} on {acc}: {metrics['num_ops']} ops | map {metrics['mapping_us']:.1f} µs | "
               f"op-sched {metrics['op_sched_us']:.1f} µs | sys-sched {metrics['sys_sched_us']:.1f} µs")
 
     # ------------------------------------------------------------------
@@ -250,21 +344,23 @@ def main():
         "gscore": "GSCore",
     }
 
-    import numpy as np
-
-    totals = [r["mapping_us"] + r["op_sched_us"] + r["sys_sched_us"] for r in results]
-    x_labels = [f"{label_map[r['pipeline']]}\n{label_map[r['accelerator']]}" for r in results]
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.bar(range(len(totals)), totals, color="#4c72b0")
-    ax.set_ylabel("Total scheduling latency (µs)")
-    ax.set_xticks(range(len(totals)))
-    ax.set_xticklabels(x_labels, rotation=45, ha="right")
-    ax.set_title("RenderSim scheduling latency – synthetic DAGs (800×800)")
-    fig.tight_layout()
-    plot_file = "simulation_speed_comparison.png"
-    fig.savefig(plot_file, dpi=300)
-    print(f"🖼️  Plot saved to {plot_file}")
+    if not args.no_plot:
+        import matplotlib.pyplot as plt  # deferred: only needed for the plot
+
+        totals = [r["mapping_us"] + r["op_sched_us"] + r["sys_sched_us"] for r in results]
+        x_labels = [f"{label_map[r['pipeline']]}\n{label_map[r['accelerator']]}" for r in results]
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.bar(range(len(totals)), totals, color="#4c72b0")
+        ax.set_ylabel("Total scheduling latency (µs)")
+        ax.set_xticks(range(len(totals)))
+        ax.set_xticklabels(x_labels, rotation=45, ha="right")
+        ax.set_title("RenderSim scheduling latency – synthetic DAGs (800×800)")
+        fig.tight_layout()
+        plot_file = "simulation_speed_comparison.png"
+        fig.savefig(plot_file, dpi=100)
+        plt.close(fig)
+        print(f"🖼️  Plot saved to {plot_file}")
 
     # ------------------------------------------------------------------
     # Pretty-print markdown table
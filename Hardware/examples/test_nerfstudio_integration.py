@@ -18,9 +18,15 @@ import sys
 import subprocess
 import json
 import time
+from collections import Counter
 from pathlib import Path
 from typing import Tuple, Optional
 
+try:
+    import orjson  # optional: C-accelerated JSON encoder for large DAG dumps
+except ImportError:
+    orjson = None
+
 # Add RenderSim to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -125,22 +131,34 @@ class NerfstudioIntegrationTest:
             
             print(f"   Loaded DAG with {len(dag.nodes)} nodes and {len(dag.edges)} edges")
             
-            # Analyze operator characteristics
-            for node_id, attrs in dag.nodes(data=True):
+            # Analyze operator characteristics (aggregate, not one line per node)
+            op_type_counts = Counter()
+            total_flops = 0
+            for _, attrs in dag.nodes(data=True):
                 if 'op_type' in attrs:
-                    print(f"   Node {node_id}: {attrs.get('op_type', 'unknown')} - {attrs.get('flops', 0)} FLOPs")
+                    op_type_counts[attrs['op_type']] += 1
+                    total_flops += attrs.get('flops', 0) or 0
+            for op_type, count in op_type_counts.most_common():
+                print(f"   {op_type}: {count} nodes")
+            print(f"   Total FLOPs: {total_flops}")
             
             # Save analysis results
             analysis_file = self.test_output_dir / "operator_analysis.json"
             analysis_data = {
                 'num_nodes': len(dag.nodes),
                 'num_edges': len(dag.edges),
-                'nodes': dict(dag.nodes(data=True)),
+                # networkx's own node->attrs dict; serialized as-is, no copy
+                'nodes': dag._node,
                 'edges': list(dag.edges())
             }
             
-            with open(analysis_file, 'w') as f:
-                json.dump(analysis_data, f, indent=2, default=str)
+            if orjson is not None:
+                with open(analysis_file, 'wb') as f:
+                    f.write(orjson.dumps(analysis_data, default=str,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(analysis_file, 'w') as f:
+                    json.dump(analysis_data, f, indent=2, default=str)
             
             print(f"   ✅ Operator analysis completed: {analysis_file}")
             return str(analysis_file)
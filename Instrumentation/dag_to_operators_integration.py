@@ -10,11 +10,25 @@ This module provides full integration between:
 
 import sys
 import pickle
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import networkx as nx
 import os
 import math
+import re
+import struct
+import weakref
+from functools import lru_cache
+from operator import index
+
+# Shape-string patterns used when inferring dims from traced node metadata
+_BRACKET_RE = re.compile(r"\[(.*?)\]$")
+_BN_RE = re.compile(r":?\((\d+)\s*,\s*(\d+)\b")
+_DIMS3_RE = re.compile(r"\((?:\d+,\s*){2}(\d+)\)")
+# Traced args/kwargs/self parameter nodes: name starts with args/kwargs, indexes them, or has a .self part
+_ARTIFACT_RE = re.compile(r"^(?:args|kwargs)|args\[|\.self")
 
 # Add paths for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -50,7 +64,55 @@ except ImportError:
 
 class OperatorFactory:
     """Factory to create actual /Operators instances from traced data."""
-    
+
+    # Constructors for operator kinds that need nothing beyond the node's (rays, samples) dims
+    _BUILDERS = {
+        'uniform_sampler': lambda dim: UniformSamplerOperator(dim, sampler_type="uniform", bitwidth=16),
+        'pdf_sampler': lambda dim: PDFSamplerOperator(dim, bitwidth=16),
+        'frustum_culling': lambda dim: FrustrumCullingOperator(dim, fov=60.0, near=0.1, far=100.0),
+        'hash_encoding': lambda dim: HashEncodingOperator(
+            dim,
+            input_dim=3,
+            num_levels=16,
+            features_per_level=2,
+            bitwidth=16
+        ),
+        'rff_encoding': lambda dim: RFFEncodingOperator(
+            dim,
+            input_dim=3,
+            num_features=60,  # Typical NeRF positional encoding
+            bitwidth=16
+        ),
+        'rgb_renderer': lambda dim: RGBRendererOperator(dim, background_color="random", bitwidth=16),
+        'density_renderer': lambda dim: DensityRendererOperator(dim, method="expected", bitwidth=16),
+    }
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _operator_kind(op_type: str) -> Optional[str]:
+        """Constructor kind selected by an operator type string (first matching rule wins).
+
+        Operator types come from a small fixed vocabulary, so each one is classified once.
+        """
+        if 'UNIFORM_SAMPLING' in op_type or 'RAY_SAMPLING' in op_type:
+            return 'uniform_sampler'
+        if 'PDF_SAMPLING' in op_type:
+            return 'pdf_sampler'
+        if 'FRUSTUM_SAMPLING' in op_type:
+            return 'frustum_culling'
+        if 'HASH_ENCODING' in op_type:
+            return 'hash_encoding'
+        if 'POSITIONAL_ENCODING' in op_type or 'RFF_ENCODING' in op_type:
+            return 'rff_encoding'
+        if 'COMPUTATION' in op_type:
+            return 'computation'
+        if 'RGB' in op_type and 'RENDERING' in op_type:
+            return 'rgb_renderer'
+        if 'DENSITY_RENDERING' in op_type or 'DEPTH_RENDERING' in op_type:
+            return 'density_renderer'
+        # Unknown types: skip creating an operator
+        return None
+
     @staticmethod
     def create_operator(function_name: str, node_data: Dict[str, Any], dim: Tuple[int, int]) -> Optional[Any]:
         """Create an actual /Operators instance from traced node data."""
@@ -60,170 +122,321 @@ class OperatorFactory:
         if op_type == 'MODEL_WRAPPER':
             return None
 
+        kind = OperatorFactory._operator_kind(op_type)
+        if kind is None:
+            return None
         try:
-            if 'UNIFORM_SAMPLING' in op_type or 'RAY_SAMPLING' in op_type:
-                return UniformSamplerOperator(dim, sampler_type="uniform", bitwidth=16)
-            
-            elif 'PDF_SAMPLING' in op_type:
-                return PDFSamplerOperator(dim, bitwidth=16)
-            
-            elif 'FRUSTUM_SAMPLING' in op_type:
-                return FrustrumCullingOperator(dim, fov=60.0, near=0.1, far=100.0)
-            
-            elif 'HASH_ENCODING' in op_type:
-                return HashEncodingOperator(
-                    dim, 
-                    input_dim=3,
-                    num_levels=16, 
-                    features_per_level=2,
-                    bitwidth=16
-                )
-            
-            elif 'POSITIONAL_ENCODING' in op_type or 'RFF_ENCODING' in op_type:
-                return RFFEncodingOperator(
-                    dim,
-                    input_dim=3,
-                    num_features=60,  # Typical NeRF positional encoding
-                    bitwidth=16
-                )
-            
-            elif 'COMPUTATION' in op_type:
-                # Prefer precise configuration from tracing metadata when available
-                fn = str(function_name)
-                nd = node_data or {}
-
-                # FieldHead (single Linear) — model as 1‑layer MLP with explicit in/out dims
-                if 'field_components.field_heads.' in fn:
-                    in_dim = None
-                    out_dim = None
-                    try:
-                        in_dim = int(nd.get('field_head_in_dim')) if nd.get('field_head_in_dim') is not None else None
-                    except Exception:
-                        in_dim = None
-                    try:
-                        out_dim = int(nd.get('field_head_out_dim')) if nd.get('field_head_out_dim') is not None else None
-                    except Exception:
-                        out_dim = None
-
-                    # Fallback: parse from shapes (B,N,C)
-                    if in_dim is None:
-                        try:
-                            import re
-                            ins = nd.get('input_shapes') or ''
-                            m = re.search(r"\((?:\d+,\s*){2}(\d+)\)", str(ins))
-                            if m:
-                                in_dim = int(m.group(1))
-                        except Exception:
-                            pass
-                    if out_dim is None:
-                        try:
-                            import re
-                            outs = nd.get('output_shapes') or ''
-                            m = re.search(r"\((?:\d+,\s*){2}(\d+)\)", str(outs))
-                            if m:
-                                out_dim = int(m.group(1))
-                        except Exception:
-                            pass
-
-                    # Reasonable fallbacks if still unknown
-                    if in_dim is None:
-                        in_dim = 128
-                    if out_dim is None:
-                        out_dim = 1 if 'DensityFieldHead' in fn else 3 if 'RGBFieldHead' in fn else 4
-
-                    return MLPOperator(
-                        dim,
-                        in_dim=in_dim,
-                        num_layers=1,
-                        layer_width=max(in_dim, out_dim),
-                        out_dim=out_dim,
-                        skip_connections=(),
-                        use_bias=True,
-                        bitwidth=16
-                    )
-
-                # MLP.forward — use exact params captured by tracer if present
+            if kind == 'computation':
+                return OperatorFactory._create_mlp_operator(function_name, node_data, dim)
+            return OperatorFactory._BUILDERS[kind](dim)
+        except Exception as e:
+            print(f"⚠️ Failed to create operator for {function_name}: {e}")
+            # Skip this node on error to avoid bogus operators
+            return None
+
+    @staticmethod
+    def _create_mlp_operator(function_name: str, node_data: Dict[str, Any], dim: Tuple[int, int]) -> Any:
+        """MLPOperator for a *COMPUTATION node, configured from tracer metadata when present."""
+        # Prefer precise configuration from tracing metadata when available
+        fn = str(function_name)
+        nd = node_data or {}
+
+        # FieldHead (single Linear) — model as 1‑layer MLP with explicit in/out dims
+        if 'field_components.field_heads.' in fn:
+            in_dim = None
+            out_dim = None
+            try:
+                in_dim = int(nd.get('field_head_in_dim')) if nd.get('field_head_in_dim') is not None else None
+            except Exception:
                 in_dim = None
+            try:
+                out_dim = int(nd.get('field_head_out_dim')) if nd.get('field_head_out_dim') is not None else None
+            except Exception:
                 out_dim = None
-                num_layers = None
-                layer_width = None
-                skip_connections = None
 
+            # Fallback: parse from shapes (B,N,C)
+            if in_dim is None:
                 try:
-                    if nd.get('mlp_in_dim') is not None:
-                        in_dim = int(nd['mlp_in_dim'])
+                    ins = nd.get('input_shapes') or ''
+                    m = _DIMS3_RE.search(str(ins))
+                    if m:
+                        in_dim = int(m.group(1))
                 except Exception:
                     pass
+            if out_dim is None:
                 try:
-                    if nd.get('mlp_out_dim') is not None:
-                        out_dim = int(nd['mlp_out_dim'])
-                except Exception:
-                    pass
-                try:
-                    if nd.get('mlp_num_layers') is not None:
-                        num_layers = int(nd['mlp_num_layers'])
-                except Exception:
-                    pass
-                try:
-                    if nd.get('mlp_layer_width') is not None:
-                        layer_width = int(nd['mlp_layer_width'])
-                except Exception:
-                    pass
-                try:
-                    sc = nd.get('mlp_skip_connections')
-                    if sc is not None:
-                        skip_connections = tuple(int(x) for x in sc) if isinstance(sc, (list, tuple)) else None
+                    outs = nd.get('output_shapes') or ''
+                    m = _DIMS3_RE.search(str(outs))
+                    if m:
+                        out_dim = int(m.group(1))
                 except Exception:
                     pass
 
-                # Fallbacks from shapes if any are missing
-                if in_dim is None:
-                    try:
-                        import re
-                        ins = nd.get('input_shapes') or nd.get('output_shapes') or ''
-                        m = re.search(r"\((?:\d+,\s*){2}(\d+)\)", str(ins))
-                        if m:
-                            in_dim = int(m.group(1))
-                    except Exception:
-                        pass
-
-                # Reasonable defaults if still unknown (vanilla NeRF base MLP)
-                if in_dim is None:
-                    in_dim = 256
-                if num_layers is None:
-                    num_layers = 8
-                if layer_width is None:
-                    layer_width = 256
-                if out_dim is None:
-                    out_dim = layer_width
-                if skip_connections is None:
-                    skip_connections = (4,)
-
-                return MLPOperator(
-                    dim,
-                    in_dim=in_dim,
-                    num_layers=num_layers,
-                    layer_width=layer_width,
-                    out_dim=out_dim,
-                    skip_connections=skip_connections,
-                    use_bias=True,
-                    bitwidth=16
-                )
-            
-            elif 'RGB' in op_type and 'RENDERING' in op_type:
-                return RGBRendererOperator(dim, background_color="random", bitwidth=16)
-            
-            elif 'DENSITY_RENDERING' in op_type or 'DEPTH_RENDERING' in op_type:
-                return DensityRendererOperator(dim, method="expected", bitwidth=16)
-            
-            else:
-                # Unknown types: skip creating an operator
-                return None
-                
-        except Exception as e:
-            print(f"⚠️ Failed to create operator for {function_name}: {e}")
-            # Skip this node on error to avoid bogus operators
+            # Reasonable fallbacks if still unknown
+            if in_dim is None:
+                in_dim = 128
+            if out_dim is None:
+                out_dim = 1 if 'DensityFieldHead' in fn else 3 if 'RGBFieldHead' in fn else 4
+
+            return MLPOperator(
+                dim,
+                in_dim=in_dim,
+                num_layers=1,
+                layer_width=max(in_dim, out_dim),
+                out_dim=out_dim,
+                skip_connections=(),
+                use_bias=True,
+                bitwidth=16
+            )
+
+        # MLP.forward — use exact params captured by tracer if present
+        in_dim = None
+        out_dim = None
+        num_layers = None
+        layer_width = None
+        skip_connections = None
+
+        try:
+            if nd.get('mlp_in_dim') is not None:
+                in_dim = int(nd['mlp_in_dim'])
+        except Exception:
+            pass
+        try:
+            if nd.get('mlp_out_dim') is not None:
+                out_dim = int(nd['mlp_out_dim'])
+        except Exception:
+            pass
+        try:
+            if nd.get('mlp_num_layers') is not None:
+                num_layers = int(nd['mlp_num_layers'])
+        except Exception:
+            pass
+        try:
+            if nd.get('mlp_layer_width') is not None:
+                layer_width = int(nd['mlp_layer_width'])
+        except Exception:
+            pass
+        try:
+            sc = nd.get('mlp_skip_connections')
+            if sc is not None:
+                skip_connections = tuple(int(x) for x in sc) if isinstance(sc, (list, tuple)) else None
+        except Exception:
+            pass
+
+        # Fallbacks from shapes if any are missing
+        if in_dim is None:
+            try:
+                ins = nd.get('input_shapes') or nd.get('output_shapes') or ''
+                m = _DIMS3_RE.search(str(ins))
+                if m:
+                    in_dim = int(m.group(1))
+            except Exception:
+                pass
+
+        # Reasonable defaults if still unknown (vanilla NeRF base MLP)
+        if in_dim is None:
+            in_dim = 256
+        if num_layers is None:
+            num_layers = 8
+        if layer_width is None:
+            layer_width = 256
+        if out_dim is None:
+            out_dim = layer_width
+        if skip_connections is None:
+            skip_connections = (4,)
+
+        return MLPOperator(
+            dim,
+            in_dim=in_dim,
+            num_layers=num_layers,
+            layer_width=layer_width,
+            out_dim=out_dim,
+            skip_connections=skip_connections,
+            use_bias=True,
+            bitwidth=16
+        )
+
+
+# Class-name fragments per taxonomy stage, checked in this order:
+# SAMPLING    - sampling operations along rays or in space
+# ENCODING    - transform spatial coordinates to feature vectors
+# FIELD_COMPUTATION - compute scene properties (density, color)
+# BLENDING    - aggregate scene properties to final pixel color
+_TAXONOMY_PATTERNS = [
+    (re.compile(r"Sampler|Sample|FrustumCulling|FrustrumCulling"), 'SAMPLING'),
+    (re.compile(r"Encoding|Encoder|Hash|RFF|Positional|Fourier"), 'ENCODING'),
+    (re.compile(r"MLP|Network|Field|Computation|Density|Color"), 'FIELD_COMPUTATION'),
+    (re.compile(r"Render|Blend|Volume|RGB|Alpha|Composite"), 'BLENDING'),
+]
+
+
+@lru_cache(maxsize=None)
+def _taxonomy_for_class(operator_class: str) -> str:
+    """4-stage taxonomy for an /Operators class name; resolved once per class."""
+    for pattern, taxonomy in _TAXONOMY_PATTERNS:
+        if pattern.search(operator_class):
+            return taxonomy
+    # Default fallback
+    print(f"⚠️ Unknown operator class: {operator_class}, defaulting to FIELD_COMPUTATION")
+    return 'FIELD_COMPUTATION'
+
+
+# Operator shape helpers can be unimplemented stubs; this marks a shape that could not be read
+_UNAVAILABLE = object()
+
+# operator -> ((input_a, output, dim) when resolved, (input shapes, output shape))
+_shape_cache: "weakref.WeakKeyDictionary[Any, Tuple[Tuple[Any, ...], Tuple[Any, Any]]]" = weakref.WeakKeyDictionary()
+
+
+def _resolve_shapes(op) -> Tuple[Any, Any]:
+    """(get_input_tensor_shapes(), get_output_tensor_shape()) for *op*, or _UNAVAILABLE per entry.
+
+    Both the transform passes and the Scheduler.IR conversion need these, so the result is
+    cached per operator and reused until its element counts or dims change.
+    """
+    stamp = (getattr(op, 'input_a', None), getattr(op, 'output', None), getattr(op, 'dim', None))
+    cached = _shape_cache.get(op)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    in_shapes = out_shape = _UNAVAILABLE
+    get_in = getattr(op, 'get_input_tensor_shapes', None)
+    if get_in is not None:
+        try:
+            in_shapes = get_in()
+        except Exception:
+            pass
+    get_out = getattr(op, 'get_output_tensor_shape', None)
+    if get_out is not None:
+        try:
+            out_shape = get_out()
+        except Exception:
+            pass
+    shapes = (in_shapes, out_shape)
+    try:
+        _shape_cache[op] = (stamp, shapes)
+    except TypeError:
+        # Not weak-referenceable: resolve again next time
+        pass
+    return shapes
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@lru_cache(maxsize=1)
+def _dataset_default_dim() -> Optional[Tuple[int, int]]:
+    """Full-frame (rays, samples) from the first local NeRF-synthetic training image, if any.
+
+    The dataset on disk does not change within a run, so the directory walk happens once.
+    """
+    try:
+        possible_roots = [
+            Path('nerf_synthetic'),
+            Path('/tmp/nerf/nerf_synthetic'),
+        ]
+        for root in possible_roots:
+            if not root.exists():
+                continue
+            sample_image = next(root.glob('**/train/*.png'), None) or next(root.glob('**/train/*.jpg'), None)
+            if sample_image is None:
+                continue
+            try:
+                # PNG: width/height sit in the IHDR chunk right after the signature
+                with open(sample_image, 'rb') as f:
+                    header = f.read(24)
+                if header[:8] == _PNG_SIGNATURE and header[12:16] == b'IHDR':
+                    width, height = struct.unpack('>II', header[16:24])
+                else:
+                    from PIL import Image
+                    with Image.open(sample_image) as im:
+                        width, height = im.size
+                if width > 0 and height > 0:
+                    # Use full-frame rays as batch size
+                    return width * height, 64
+            except Exception:
+                # Ignore decode errors and fall back to defaults
+                pass
             return None
+    except Exception:
+        # Ignore filesystem errors and fall back to defaults
+        pass
+    return None
+
+
+def _traced_topological_order(preds: Dict[Any, List[Any]], succs: Dict[Any, List[Any]]) -> Optional[List[Any]]:
+    """Kahn order (sources first) over every traced node that has an edge; None if the trace has a cycle."""
+    indegree = {dst: len(srcs) for dst, srcs in preds.items()}
+    for src in succs:
+        indegree.setdefault(src, 0)
+    ready = deque(n for n, d in indegree.items() if d == 0)
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for s in succs.get(node, ()):
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                ready.append(s)
+    return order if len(order) == len(indegree) else None
+
+
+def _nearest_upstream(order: List[Any], preds: Dict[Any, List[Any]],
+                      is_match: Callable[[Any], bool]) -> Dict[Any, Tuple[int, Any]]:
+    """For every node, the first ancestor satisfying *is_match* in upstream BFS order.
+
+    Computed once over a topological *order*: a node's answer is the closest of its
+    predecessors' answers (ties go to the earlier predecessor, as in the BFS queue).
+    Returns node -> (hops, ancestor); nodes without a match are absent.
+    """
+    nearest: Dict[Any, Tuple[int, Any]] = {}
+    for node in order:
+        best = None
+        for p in preds.get(node, ()):
+            if is_match(p):
+                cand = (1, p)
+            else:
+                sub = nearest.get(p)
+                if sub is None:
+                    continue
+                cand = (sub[0] + 1, sub[1])
+            if best is None or cand[0] < best[0]:
+                best = cand
+        if best is not None:
+            nearest[node] = best
+    return nearest
+
+
+def _upstream_matches(order: List[Any], preds: Dict[Any, List[Any]],
+                      is_match: Callable[[Any], bool], limit: int) -> Dict[Any, List[Any]]:
+    """For every node, the first *limit* distinct ancestors satisfying *is_match* in
+    upstream BFS order, where the walk does not continue past a match.
+
+    Same DP as :func:`_nearest_upstream`, keeping the best *limit* entries per node;
+    a predecessor's later matches can never precede its first *limit*.
+    """
+    found: Dict[Any, List[Tuple[int, Any]]] = {}
+    for node in order:
+        cands = []
+        for i, p in enumerate(preds.get(node, ())):
+            if is_match(p):
+                cands.append((1, i, 0, p))
+            else:
+                for j, (hops, m) in enumerate(found.get(p, ())):
+                    cands.append((hops + 1, i, j, m))
+        if not cands:
+            continue
+        cands.sort(key=lambda c: c[:3])
+        picked: List[Tuple[int, Any]] = []
+        seen = set()
+        for hops, _, _, m in cands:
+            if m not in seen:
+                seen.add(m)
+                picked.append((hops, m))
+                if len(picked) == limit:
+                    break
+        found[node] = picked
+    return {node: [m for _, m in picked] for node, picked in found.items()}
+
 
 class DAGToOperatorsIntegration:
     """Complete integration system for DAG transformation."""
@@ -233,15 +446,7 @@ class DAGToOperatorsIntegration:
     
     def _is_parameter_artifact(self, function_name: str, node_id: str) -> bool:
         name = (function_name or str(node_id)).lower()
-        if name == 'args' or name == 'kwargs':
-            return True
-        if name.startswith('args') or name.startswith('kwargs'):
-            return True
-        if 'args[' in name or 'kwargs[' in name:
-            return True
-        if name.endswith('.self') or name.endswith('].self') or '.self' in name:
-            return True
-        return False
+        return _ARTIFACT_RE.search(name) is not None
     
     def extract_tensor_dimensions(self, dag_data: Dict[str, Any]) -> Tuple[int, int]:
         """Extract realistic tensor dimensions from traced DAG data."""
@@ -253,7 +458,7 @@ class DAGToOperatorsIntegration:
                         if isinstance(inp, dict) and 'shape' in inp:
                             shape = inp['shape']
                             if len(shape) >= 1:
-                                total_rays = shape[0]
+                                total_rays = int(shape[0])
                                 # Estimate samples per ray (typical NeRF uses 64-128)
                                 samples_per_ray = 64
                                 if total_rays > 10000:  # Large batch
@@ -262,32 +467,9 @@ class DAGToOperatorsIntegration:
                                     return total_rays, samples_per_ray
         
         # If shapes are missing, attempt to infer image resolution from dataset images
-        try:
-            from pathlib import Path
-            possible_roots = [
-                Path('nerf_synthetic'),
-                Path('/tmp/nerf/nerf_synthetic'),
-            ]
-            image_paths = []
-            for root in possible_roots:
-                if root.exists():
-                    image_paths += list(root.glob('**/train/*.png'))
-                    image_paths += list(root.glob('**/train/*.jpg'))
-            if image_paths:
-                sample_image = image_paths[0]
-                try:
-                    from PIL import Image
-                    with Image.open(sample_image) as im:
-                        width, height = im.size
-                        if width > 0 and height > 0:
-                            # Use full-frame rays as batch size
-                            return width * height, 64
-                except Exception:
-                    # Ignore PIL errors and fall back below
-                    pass
-        except Exception:
-            # Ignore filesystem errors and fall back below
-            pass
+        dataset_dim = _dataset_default_dim()
+        if dataset_dim is not None:
+            return dataset_dim
      
         # Default neural rendering dimensions
         return 4096, 64  # 4096 rays, 64 samples per ray
@@ -304,22 +486,25 @@ class DAGToOperatorsIntegration:
                 if isinstance(item, dict) and 'shape' in item:
                     shape = item['shape']
                     if isinstance(shape, (list, tuple)) and len(shape) >= 2:
-                        B = shape[0]
-                        N = shape[1]
-                        if isinstance(B, int) and isinstance(N, int) and B > 0 and N > 0:
+                        # Anything with __index__ counts (numpy scalars, 0-d integer
+                        # tensors); keys downstream are plain ints
+                        try:
+                            B, N = index(shape[0]), index(shape[1])
+                        except TypeError:
+                            continue
+                        if B > 0 and N > 0:
                             return (B, N)
         
         # 2) Parse from shape-aware function_name or output_shapes strings
-        import re
         func_str = str(node_data.get('function_name', node_id))
         candidates: list[tuple[int, int]] = []
         # Extract bracket content [...] if present
-        m = re.search(r"\[(.*?)\]$", func_str)
+        m = _BRACKET_RE.search(func_str)
         shape_sig = m.group(1) if m else ""
         parts_to_search = [shape_sig, str(node_data.get('output_shapes', '')), str(node_data.get('input_shapes', ''))]
         for text in parts_to_search:
             # Look for patterns like :(B, N, ...) or (B, N, ...)
-            for mm in re.finditer(r":?\((\d+)\s*,\s*(\d+)\b", text):
+            for mm in _BN_RE.finditer(text):
                 try:
                     B = int(mm.group(1))
                     N = int(mm.group(2))
@@ -342,10 +527,15 @@ class DAGToOperatorsIntegration:
         B_base, N_base = self.extract_tensor_dimensions(dag_data)
         default_dim = (B_base, N_base)
         print(f"   📐 Baseline dimensions: {B_base} rays × {N_base} samples")
+        nodes_dict = dag_data.get('nodes', {}) or {}
+        edges_list = dag_data.get('edges', []) or []
         
         # Create /Operators graph
         operators_graph = OperatorsGraph()
         node_mapping = {}  # traced_node_id -> operator_instance
+        op_indegree: Dict[Any, int] = {}  # operator -> parents in the operator graph, kept by _safe_connect
+        ancestors: Dict[Any, set] = {}  # operator -> same-stage operators that reach it, kept by _safe_connect
+        linked: Dict[Any, set] = defaultdict(set)  # operator -> children added by _safe_connect
         characteristics = {
             'total_flops': 0,
             'total_memory_bytes': 0,
@@ -358,19 +548,26 @@ class DAGToOperatorsIntegration:
         fallback_nodes: set[str] = set()
         
         # Build adjacency for neighbor lookups
-        succs: Dict[str, List[str]] = {}
-        preds: Dict[str, List[str]] = {}
-        for edge in dag_data.get('edges', []) or []:
+        succs: Dict[str, List[str]] = defaultdict(list)
+        preds: Dict[str, List[str]] = defaultdict(list)
+        for edge in edges_list:
             if len(edge) >= 2:
                 src_id, dst_id = edge[0], edge[1]
-                succs.setdefault(src_id, []).append(dst_id)
-                preds.setdefault(dst_id, []).append(src_id)
+                succs[src_id].append(dst_id)
+                preds[dst_id].append(src_id)
+        # Upstream queries below are answered once over this order (None: cyclic trace)
+        traced_order = _traced_topological_order(preds, succs)
         
+        # Parameter artifacts are skipped by every pass below; classify each node once
+        artifact_ids = {
+            nid for nid, nd in nodes_dict.items()
+            if self._is_parameter_artifact(nd.get('function_name', str(nid)), nid)
+        }
+
         # First pass: strict per-node inference; store None if unavailable
         missing: List[str] = []
-        for node_id, node_data in dag_data.get('nodes', {}).items():
-            function_name = node_data.get('function_name', str(node_id))
-            if self._is_parameter_artifact(function_name, node_id):
+        for node_id, node_data in nodes_dict.items():
+            if node_id in artifact_ids:
                 per_node_dims[node_id] = None
                 continue
             try:
@@ -380,47 +577,36 @@ class DAGToOperatorsIntegration:
                 per_node_dims[node_id] = None
                 missing.append(node_id)
         
-        # Second pass: resolve missing by neighbors (predecessors, then successors)
+        # Second pass: resolve missing by neighbors (predecessors, then successors).
+        # Dims spread outward from resolved nodes one hop per layer (multi-source BFS)
         if missing:
+            def _is_dim_source(nid) -> bool:
+                return nid not in artifact_ids and per_node_dims.get(nid) is not None
+
             unresolved = set(missing)
-            changed = True
-            max_iters = 3
-            it = 0
-            while changed and unresolved and it < max_iters:
-                changed = False
-                it += 1
-                to_remove = []
-                for nid in list(unresolved):
-                    # Check predecessors
-                    found = None
-                    for p in preds.get(nid, []):
-                        p_fn = dag_data['nodes'][p].get('function_name', str(p))
-                        if self._is_parameter_artifact(p_fn, p):
-                            continue
-                        if per_node_dims.get(p) is not None:
-                            found = per_node_dims[p]
-                            break
-                    # If not found, check successors
+            frontier = [nid for nid, dim in per_node_dims.items() if dim is not None]
+            while frontier:
+                candidates = {}
+                for nid in frontier:
+                    if not _is_dim_source(nid):
+                        continue
+                    for nb in succs.get(nid, []) + preds.get(nid, []):
+                        if nb in unresolved:
+                            candidates[nb] = None
+                # Pick from dims known before this layer so the result is order-independent
+                for nid in candidates:
+                    found = next((per_node_dims[p] for p in preds.get(nid, []) if _is_dim_source(p)), None)
                     if found is None:
-                        for s in succs.get(nid, []):
-                            s_fn = dag_data['nodes'][s].get('function_name', str(s))
-                            if self._is_parameter_artifact(s_fn, s):
-                                continue
-                            if per_node_dims.get(s) is not None:
-                                found = per_node_dims[s]
-                                break
-                    if found is not None:
-                        per_node_dims[nid] = found
-                        to_remove.append(nid)
-                        changed = True
-                for nid in to_remove:
-                    unresolved.discard(nid)
+                        found = next((per_node_dims[s] for s in succs.get(nid, []) if _is_dim_source(s)), None)
+                    candidates[nid] = found
+                per_node_dims.update(candidates)
+                unresolved.difference_update(candidates)
+                frontier = list(candidates)
         
         # If still unresolved, default to baseline dims and warn (lenient mode)
         still_missing = []
         for nid, dim in per_node_dims.items():
-            fn = dag_data['nodes'][nid].get('function_name', str(nid))
-            if self._is_parameter_artifact(fn, nid):
+            if nid in artifact_ids:
                 continue
             if dim is None:
                 still_missing.append(nid)
@@ -428,7 +614,7 @@ class DAGToOperatorsIntegration:
             try:
                 sample_list = []
                 for nid in still_missing[:5]:
-                    f = dag_data['nodes'][nid].get('function_name', str(nid))
+                    f = nodes_dict[nid].get('function_name', str(nid))
                     sample_list.append(f"{nid} -> {f}")
                 print(f"⚠️  {len(still_missing)} nodes missing dims; defaulting to baseline {default_dim}. Examples: " + "; ".join(sample_list))
             except Exception:
@@ -440,10 +626,14 @@ class DAGToOperatorsIntegration:
                 except Exception:
                     pass
         
-        # Create operators
-        for node_id, node_data in dag_data.get('nodes', {}).items():
+        # Create operators; totals are accumulated locally and stored once at the end
+        total_flops = 0
+        total_memory_bytes = 0
+        op_type_counts: Counter = Counter()
+        realistic_operators = characteristics['realistic_operators']
+        for node_id, node_data in nodes_dict.items():
             function_name = node_data.get('function_name', str(node_id))
-            if self._is_parameter_artifact(function_name, node_id):
+            if node_id in artifact_ids:
                 continue
             # Skip nodes that fell back to baseline dims to avoid scheduling unrealistic operators
             if str(node_id) in fallback_nodes:
@@ -454,70 +644,110 @@ class DAGToOperatorsIntegration:
             if operator:
                 operators_graph.nodes.add(operator)
                 node_mapping[node_id] = operator
+                op_indegree[operator] = 0
+                ancestors[operator] = set()
                 
                 # Collect characteristics
-                characteristics['total_flops'] += operator.get_num_ops()
-                characteristics['total_memory_bytes'] += (operator.input_a + operator.output) * 4
-                characteristics['operator_types'][operator.op_type] = characteristics['operator_types'].get(operator.op_type, 0) + 1
-                characteristics['realistic_operators'].append({
+                op_type = sys.intern(operator.op_type)
+                flops = operator.get_num_ops()
+                memory_bytes = (operator.input_a + operator.output) * 4
+                total_flops += flops
+                total_memory_bytes += memory_bytes
+                op_type_counts[op_type] += 1
+                realistic_operators.append({
                     'original_id': node_id,
                     'function_name': function_name,
-                    'op_type': operator.op_type,
+                    'op_type': op_type,
                     'input_elements': operator.input_a,
                     'output_elements': operator.output,
-                    'flop_count': operator.get_num_ops(),
-                    'memory_bytes': (operator.input_a + operator.output) * 4,
+                    'flop_count': flops,
+                    'memory_bytes': memory_bytes,
                     'dim': node_dim,
                 })
+        characteristics['total_flops'] = total_flops
+        characteristics['total_memory_bytes'] = total_memory_bytes
+        characteristics['operator_types'] = dict(op_type_counts)
+        # No operators are added after this point; every pass below walks this one sequence
+        graph_nodes = list(operators_graph.nodes)
         
-        # Helpers to keep graph acyclic and ordered by taxonomy
-        def _taxonomy(op_obj):
-            return self._map_operator_to_taxonomy(op_obj)
-
+        # Taxonomy and stage order are queried for the same operators in every pass below;
+        # operators are not mutated here, so resolve both once per operator
         _ORDER = {
             'SAMPLING': 0,
             'ENCODING': 1,
             'FIELD_COMPUTATION': 2,
             'BLENDING': 3,
         }
+        op_tax: Dict[Any, str] = {}
+        op_order: Dict[Any, int] = {}
+        for op in graph_nodes:
+            t = op_tax[op] = self._map_operator_to_taxonomy(op)
+            op_order[op] = _ORDER.get(t, 99)
+        tax = op_tax.__getitem__
 
-        def _order_of(op_obj) -> int:
-            return _ORDER.get(_taxonomy(op_obj), 99)
-
-        def _would_create_cycle(src, dst) -> bool:
+        # (B,N) keys of each operator's first input, output and dim. The augmentation
+        # passes below match on these repeatedly, so query the shapes once per operator
+        def _bn(shape):
             try:
-                # DFS from dst to see if src is reachable
-                seen = set()
-                stack = [dst]
-                while stack:
-                    cur = stack.pop()
-                    if cur is src:
-                        return True
-                    for ch in getattr(cur, 'children', []) or []:
-                        if ch not in seen:
-                            seen.add(ch)
-                            stack.append(ch)
+                if isinstance(shape, (list, tuple)) and len(shape) >= 2:
+                    return (int(shape[0]), int(shape[1]))
             except Exception:
-                pass
-            return False
+                return None
+            return None
+
+        op_shapes: Dict[int, Tuple[Optional[Tuple[int, int]], ...]] = {}
+        for op in graph_nodes:
+            in_shapes, out_shape = _resolve_shapes(op)
+            bn_in = _bn(in_shapes[0]) if in_shapes is not _UNAVAILABLE and in_shapes else None
+            bn_out = _bn(out_shape) if out_shape is not _UNAVAILABLE else None
+            op_shapes[id(op)] = (bn_in, bn_out, _bn(getattr(op, 'dim', None)))
+
+        # Helpers to keep graph acyclic and ordered by taxonomy
+        def _link_ancestors(src, dst) -> None:
+            # Only same-stage ancestors are kept: the cycle check never asks about others,
+            # and a same-stage path cannot leave the stage. Push src and its ancestors
+            # into dst and every same-stage operator below it
+            order = op_order[dst]
+            if op_order[src] != order:
+                return
+            inherited = ancestors.get(src, set()) | {src}
+            stack = [dst]
+            while stack:
+                cur = stack.pop()
+                anc = ancestors.setdefault(cur, set())
+                if inherited <= anc:
+                    continue
+                anc |= inherited
+                stack.extend(ch for ch in linked.get(cur, ()) if op_order[ch] == order)
 
         def _safe_connect(src, dst) -> bool:
+            # src and dst are always operators of this graph, so the bookkeeping lookups
+            # cannot fail; only the operator's own add_child is guarded
+            if src is dst:
+                return False
+            # Already connected: nothing to check or add
+            if dst in linked[src]:
+                return True
+            # Enforce forward stage order
+            src_order = op_order[src]
+            dst_order = op_order[dst]
+            if dst_order < src_order:
+                return False
+            # Prevent cycles. Stage order never decreases along an edge, so dst can
+            # only reach src when both are in the same stage
+            if dst_order == src_order and dst in ancestors.get(src, ()):
+                return False
             try:
-                if src is dst:
-                    return False
-                # Enforce forward stage order
-                if _order_of(dst) < _order_of(src):
-                    return False
-                # Prevent cycles
-                if _would_create_cycle(src, dst):
-                    return False
                 src.add_child(dst)
-                return True
             except Exception:
                 return False
+            linked[src].add(dst)
+            op_indegree[dst] = op_indegree.get(dst, 0) + 1
+            _link_ancestors(src, dst)
+            return True
 
         # Wire dependencies based on traced edges
-        for edge in dag_data.get('edges', []):
+        for edge in edges_list:
             if len(edge) >= 2:
                 src_id, dst_id = edge[0], edge[1]
                 if src_id in node_mapping and dst_id in node_mapping:
@@ -528,40 +758,40 @@ class DAGToOperatorsIntegration:
         # Augment missing ENCODING -> FIELD_COMPUTATION edges when FIELD nodes have no predecessors
         # and more generally, connect any zero in-degree operator to the nearest mapped predecessor
         try:
-            # Build operator indegree
-            op_indegree = {}
-            graph_nodes = list(operators_graph.nodes)
-            for op in graph_nodes:
-                op_indegree[op] = 0
-            for op in graph_nodes:
-                for ch in getattr(op, 'children', []) or []:
-                    op_indegree[ch] = op_indegree.get(ch, 0) + 1
- 
-            def _op_taxonomy(op_obj):
-                return self._map_operator_to_taxonomy(op_obj)
- 
+            if traced_order is not None:
+                nearest_mapped = _nearest_upstream(
+                    traced_order, preds, lambda n: node_mapping.get(n) is not None)
+                nearest_encoding = _nearest_upstream(
+                    traced_order, preds,
+                    lambda n: node_mapping.get(n) is not None and tax(node_mapping[n]) == 'ENCODING')
+
             def _bfs_find_predecessor(start_traced_id: str, prefer_encoding: bool = False):
-                """BFS upstream in the original traced DAG to find a mapped predecessor.
+                """Nearest mapped predecessor upstream in the original traced DAG (BFS order).
                 If prefer_encoding is True, first try to find ENCODING; otherwise accept any mapped op.
                 If no preferred found, fall back to any mapped predecessor.
                 """
-                visited = set()
-                queue = list(preds.get(start_traced_id, []))
+                if traced_order is not None:
+                    hit = nearest_encoding.get(start_traced_id) if prefer_encoding else None
+                    if hit is None:
+                        hit = nearest_mapped.get(start_traced_id)
+                    return node_mapping[hit[1]] if hit is not None else None
+                # Cyclic trace: walk upstream from this node
+                # Nodes are marked when enqueued, so each one enters the queue once
+                queue = deque(dict.fromkeys(preds.get(start_traced_id, [])))
+                visited = set(queue)
                 fallback_found = None
                 while queue:
-                    cur = queue.pop(0)
-                    if cur in visited:
-                        continue
-                    visited.add(cur)
+                    cur = queue.popleft()
                     m = node_mapping.get(cur)
                     if m is not None:
-                        if prefer_encoding and _op_taxonomy(m) == 'ENCODING':
+                        if prefer_encoding and tax(m) == 'ENCODING':
                             return m
                         if fallback_found is None:
                             fallback_found = m
                     # continue walking upstream
                     for pp in preds.get(cur, []) or []:
                         if pp not in visited:
+                            visited.add(pp)
                             queue.append(pp)
                 return fallback_found
  
@@ -572,7 +802,7 @@ class DAGToOperatorsIntegration:
                 # Only consider nodes currently with zero in-degree in the operator graph
                 if op_indegree.get(op_obj, 0) > 0:
                     continue
-                taxonomy = _op_taxonomy(op_obj)
+                taxonomy = tax(op_obj)
  
                 found = None
                 if taxonomy == 'FIELD_COMPUTATION':
@@ -596,80 +826,42 @@ class DAGToOperatorsIntegration:
         # Shape-based fallback: for any remaining zero in-degree FIELD_COMPUTATION,
         # connect to nearest ENCODING (preferred) or SAMPLING op with matching (B,N)
         try:
-            graph_nodes = list(operators_graph.nodes)
-            # Recompute indegree after previous augmentation
-            op_indegree = {op: 0 for op in graph_nodes}
-            for op in graph_nodes:
-                for ch in getattr(op, 'children', []) or []:
-                    op_indegree[ch] = op_indegree.get(ch, 0) + 1
- 
             # Build (B,N) -> candidate lists for ENCODING and SAMPLING
-            def _bn(shape):
-                try:
-                    if isinstance(shape, (list, tuple)) and len(shape) >= 2:
-                        return (int(shape[0]), int(shape[1]))
-                except Exception:
-                    return None
-                return None
- 
             encoding_by_bn = {}
             sampling_by_bn = {}
  
             for op in graph_nodes:
-                try:
-                    t = self._map_operator_to_taxonomy(op)
-                    # Prefer output shape; fallback to input if output unavailable
-                    out_shape = None
-                    in_shapes = None
-                    if hasattr(op, 'get_output_tensor_shape'):
-                        try:
-                            out_shape = op.get_output_tensor_shape()
-                        except Exception:
-                            out_shape = None
-                    if hasattr(op, 'get_input_tensor_shapes'):
-                        try:
-                            in_shapes = op.get_input_tensor_shapes() or []
-                        except Exception:
-                            in_shapes = []
-                    key = _bn(out_shape) or (_bn(in_shapes[0]) if in_shapes else None)
-                    if not key:
-                        continue
-                    if t == 'ENCODING':
-                        encoding_by_bn.setdefault(key, []).append(op)
-                    elif t == 'SAMPLING':
-                        sampling_by_bn.setdefault(key, []).append(op)
-                except Exception:
+                t = tax(op)
+                # Prefer output shape; fallback to input if output unavailable
+                bn_in, bn_out, _ = op_shapes[id(op)]
+                key = bn_out or bn_in
+                if not key:
                     continue
+                if t == 'ENCODING':
+                    encoding_by_bn.setdefault(key, []).append(op)
+                elif t == 'SAMPLING':
+                    sampling_by_bn.setdefault(key, []).append(op)
  
             added_by_shape = 0
             for op in graph_nodes:
-                try:
-                    if op_indegree.get(op, 0) > 0:
-                        continue
-                    if self._map_operator_to_taxonomy(op) != 'FIELD_COMPUTATION':
-                        continue
-                    # FC input shape drives linkage
-                    in_shapes = []
-                    if hasattr(op, 'get_input_tensor_shapes'):
-                        try:
-                            in_shapes = op.get_input_tensor_shapes() or []
-                        except Exception:
-                            in_shapes = []
-                    key = _bn(in_shapes[0]) if in_shapes else None
-                    if not key:
-                        continue
-                    src = None
-                    cands = encoding_by_bn.get(key) or []
+                if op_indegree.get(op, 0) > 0:
+                    continue
+                if tax(op) != 'FIELD_COMPUTATION':
+                    continue
+                # FC input shape drives linkage
+                key = op_shapes[id(op)][0]
+                if not key:
+                    continue
+                src = None
+                cands = encoding_by_bn.get(key) or []
+                if cands:
+                    src = cands[0]
+                else:
+                    cands = sampling_by_bn.get(key) or []
                     if cands:
                         src = cands[0]
-                    else:
-                        cands = sampling_by_bn.get(key) or []
-                        if cands:
-                            src = cands[0]
-                    if src is not None and _safe_connect(src, op):
-                        added_by_shape += 1
-                except Exception:
-                    continue
+                if src is not None and _safe_connect(src, op):
+                    added_by_shape += 1
             if added_by_shape:
                 print(f"   🔗 Shape-based augmentation added {added_by_shape} ENCODING/SAMPLING→FIELD links by (B,N) match")
         except Exception:
@@ -678,36 +870,56 @@ class DAGToOperatorsIntegration:
         # Core-only edge projection: contract wrappers/aux nodes to enforce
         # SAMPLING/ENCODING -> FIELD_COMPUTATION -> BLENDING dependencies
         try:
-            graph_nodes = list(operators_graph.nodes)
             # Build reverse map: operator instance -> traced id(s)
             op_to_traced = {}
             for tid, op in node_mapping.items():
                 op_to_traced.setdefault(op, []).append(tid)
  
-            def _taxonomy(op_obj) -> str:
-                return self._map_operator_to_taxonomy(op_obj)
- 
-            # Helper: (B,N) key from operator shapes if available
+            # Helper: (B,N) key from the operator's input shape, else its dim
             def _bn_of_op(op_obj):
-                try:
-                    if hasattr(op_obj, 'get_input_tensor_shapes'):
-                        ins = op_obj.get_input_tensor_shapes() or []
-                        if ins and isinstance(ins[0], (list, tuple)) and len(ins[0]) >= 2:
-                            return (int(ins[0][0]), int(ins[0][1]))
-                except Exception:
-                    pass
-                try:
-                    dim = getattr(op_obj, 'dim', None)
-                    if isinstance(dim, (list, tuple)) and len(dim) >= 2:
-                        return (int(dim[0]), int(dim[1]))
-                except Exception:
-                    pass
-                return None
+                bn_in, _, bn_dim = op_shapes[id(op_obj)]
+                return bn_in if bn_in is not None else bn_dim
  
+            # Nearest upstream producers per (preferred types, (B,N)) query, shared by all operators
+            core_matches: Dict[Any, Dict[Any, List[Any]]] = {}
+
+            def _core_sources(tid, preferred, bn_self):
+                def _is_source(n):
+                    src_op = node_mapping.get(n)
+                    if src_op is None or tax(src_op) not in preferred:
+                        return False
+                    bn_src = _bn_of_op(src_op)
+                    return bn_self is None or bn_src is None or bn_src == bn_self
+
+                if traced_order is not None:
+                    key = (preferred, bn_self)
+                    table = core_matches.get(key)
+                    if table is None:
+                        # collect a couple to reduce fan-in
+                        table = core_matches[key] = _upstream_matches(traced_order, preds, _is_source, limit=2)
+                    return [node_mapping[n] for n in table.get(tid, ())]
+
+                # Cyclic trace: walk upstream from this node, stopping at matches
+                # Nodes are marked when enqueued, so each one enters the queue once
+                queue = deque(dict.fromkeys(preds.get(tid, [])))
+                visited = set(queue)
+                local_found = []
+                while queue and len(local_found) < 2:  # collect a couple to reduce fan-in
+                    cur = queue.popleft()
+                    if _is_source(cur):
+                        local_found.append(node_mapping[cur])
+                        continue
+                    # Continue walking upstream through non-core or non-preferred
+                    for pp in preds.get(cur, []) or []:
+                        if pp not in visited:
+                            visited.add(pp)
+                            queue.append(pp)
+                return local_found
+
             # For each core operator, add edges from nearest upstream core producers
             added_core_edges = 0
             for op in graph_nodes:
-                t = _taxonomy(op)
+                t = tax(op)
                 if t not in ('SAMPLING','ENCODING','FIELD_COMPUTATION','BLENDING'):
                     continue
                 # Collect candidate traced ids for this operator
@@ -723,56 +935,35 @@ class DAGToOperatorsIntegration:
                     preferred = tuple()
                 if not preferred:
                     continue
-                # For each traced id mapped to this operator, BFS upstream to nearest core of preferred types
+                # For each traced id mapped to this operator, find the nearest upstream cores of preferred types
                 bn_self = _bn_of_op(op)
                 found_sources = []
                 for tid in tids:
-                    visited = set()
-                    queue = list(preds.get(tid, []))
-                    local_found = []
-                    while queue and len(local_found) < 2:  # collect a couple to reduce fan-in
-                        cur = queue.pop(0)
-                        if cur in visited:
-                            continue
-                        visited.add(cur)
-                        src_op = node_mapping.get(cur)
-                        if src_op is not None:
-                            tax = _taxonomy(src_op)
-                            if tax in preferred:
-                                if bn_self is None or _bn_of_op(src_op) is None or _bn_of_op(src_op) == bn_self:
-                                    local_found.append(src_op)
-                                    continue
-                        # Continue walking upstream through non-core or non-preferred
-                        for pp in preds.get(cur, []) or []:
-                            if pp not in visited:
-                                queue.append(pp)
-                    found_sources.extend(local_found)
+                    found_sources.extend(_core_sources(tid, preferred, bn_self))
                 # Add edges from sources to current operator
                 for src in found_sources:
-                    try:
-                        if op not in getattr(src, 'children', []) and _safe_connect(src, op):
-                            added_core_edges += 1
-                    except Exception:
-                        pass
+                    # linked mirrors each operator's graph children; _safe_connect never raises
+                    if op not in linked[src] and _safe_connect(src, op):
+                        added_core_edges += 1
             if added_core_edges:
                 print(f"   🔗 Core-only projection added {added_core_edges} wrapper-contracted edges")
         except Exception:
             pass
 
-        # Summary of dims present
-        try:
-            unique_dims = sorted(set(dim for dim in per_node_dims.values() if dim is not None))
-            for (b, n) in unique_dims:
-                print(f"   🎯 Dims present: {b} rays × {n} samples")
-        except Exception:
-            pass
+        # Summary of dims present, with how many traced nodes carry each
+        dim_counts = Counter(dim for dim in per_node_dims.values() if dim is not None)
+        if dim_counts:
+            # One write for the whole summary rather than one per distinct dim
+            print("\n".join(
+                f"   🎯 Dims present: {b} rays × {n} samples (×{count})"
+                for (b, n), count in sorted(dim_counts.items())
+            ))
 
         # Optional: Transitive reduction on operator edges to remove redundant parent→grandchild links
         # Example: if A→B and B→C exist, drop A→C. Keeps graph minimal for readability.
         try:
             # Build operator graph in NetworkX
             Gop = nx.DiGraph()
-            graph_nodes = list(operators_graph.nodes)
             idx = {op: i for i, op in enumerate(graph_nodes)}
             for op in graph_nodes:
                 Gop.add_node(idx[op])
@@ -805,67 +996,47 @@ class DAGToOperatorsIntegration:
             # Never fail transformation due to a visualization/cleanup step
             pass
         
-        print(f"   [OK] Created {len(operators_graph)} realistic operators")
-        print(f"   📊 Total FLOPs: {characteristics['total_flops']:,}")
-        print(f"   💾 Total Memory: {characteristics['total_memory_bytes']:,} bytes ({characteristics['total_memory_bytes']/1024/1024:.1f} MB)")
+        total_memory = characteristics['total_memory_bytes']
+        print(
+            f"   [OK] Created {len(operators_graph)} realistic operators\n"
+            f"   📊 Total FLOPs: {characteristics['total_flops']:,}\n"
+            f"   💾 Total Memory: {total_memory:,} bytes ({total_memory/1024/1024:.1f} MB)"
+        )
         
         return operators_graph, characteristics
     
     def _map_operator_to_taxonomy(self, operator) -> str:
         """Map /Operators instance to 4-stage unified taxonomy."""
-        operator_class = type(operator).__name__
-        
-        # Field Sampler (SAMPLING) - sampling operations along rays or in space
-        if any(term in operator_class for term in ['Sampler', 'Sample', 'FrustumCulling', 'FrustrumCulling']):
-            return 'SAMPLING'
-        
-        # Encoding (ENCODING) - transform spatial coordinates to feature vectors
-        elif any(term in operator_class for term in ['Encoding', 'Encoder', 'Hash', 'RFF', 'Positional', 'Fourier']):
-            return 'ENCODING'
-        
-        # Field Computation (FIELD_COMPUTATION) - compute scene properties (density, color)
-        elif any(term in operator_class for term in ['MLP', 'Network', 'Field', 'Computation', 'Density', 'Color']):
-            return 'FIELD_COMPUTATION'
-        
-        # Blending (BLENDING) - aggregate scene properties to final pixel color
-        elif any(term in operator_class for term in ['Render', 'Blend', 'Volume', 'RGB', 'Alpha', 'Composite']):
-            return 'BLENDING'
-        
-        # Default fallback
-        else:
-            print(f"⚠️ Unknown operator class: {operator_class}, defaulting to FIELD_COMPUTATION")
-            return 'FIELD_COMPUTATION'
+        return _taxonomy_for_class(type(operator).__name__)
     
     def operators_to_scheduler_ir(self, operators_graph: OperatorsGraph, node_mapping: Dict[str, Any]) -> SchedulerOperatorGraph:
         """Convert /Operators instances to Scheduler.IR format.
-        Supports optional non-collapsing rendering mode via env RENDERSIM_SPLIT_RENDERING=1
-        which splits BLENDING/VOLUME_RENDERING into multiple smaller ops by samples dimension.
+        Emits one scheduler node per operator (id ``op_<index>``); rendering is not split here,
+        instrumentation should record separate calls if it wants multiple rendering ops.
         """
         print(f"🔄 Converting to Scheduler.IR format...")
-        split_rendering = False
         
         scheduler_graph = SchedulerOperatorGraph()
         node_list = list(operators_graph.nodes)
         
-        # Map original operator index -> list of scheduler node ids
-        op_idx_to_sched_ids: Dict[int, List[str]] = {}
+        # Node ids are built (and interned) once; both passes index this table by position
+        sched_ids: List[str] = [sys.intern(f"op_{i}") for i in range(len(node_list))]
         
-        # First pass: create scheduler nodes (with optional rendering split)
+        # First pass: create scheduler nodes
         for i, operator in enumerate(node_list):
             # Prefer shape helpers if implemented; otherwise fall back to element counts
             in_shape = None
             out_shape = None
-            try:
-                if hasattr(operator, "get_input_tensor_shapes") and hasattr(operator, "get_output_tensor_shape"):
-                    input_shapes = operator.get_input_tensor_shapes()
-                    output_shape = operator.get_output_tensor_shape()
+            input_shapes, output_shape = _resolve_shapes(operator)
+            if input_shapes is not _UNAVAILABLE and output_shape is not _UNAVAILABLE:
+                try:
                     if input_shapes and isinstance(input_shapes[0], (list, tuple)):
                         in_shape = list(input_shapes[0])
                     if isinstance(output_shape, (list, tuple)):
                         out_shape = list(output_shape)
-            except Exception:
-                in_shape = None
-                out_shape = None
+                except Exception:
+                    in_shape = None
+                    out_shape = None
             # Fallbacks based on element counts when shapes are unavailable
             if in_shape is None:
                 in_elems = getattr(operator, "input_a", 1) or 1
@@ -873,82 +1044,116 @@ class DAGToOperatorsIntegration:
             if out_shape is None:
                 out_elems = getattr(operator, "output", 1) or 1
                 out_shape = [int(out_elems), 1]
-            # Ensure minimum rank 2
+            # Ensure minimum rank 2 (both shapes are fresh lists here, so pad in place)
             if len(in_shape) < 2:
-                in_shape = list(in_shape) + [1] * (2 - len(in_shape))
+                in_shape.extend([1] * (2 - len(in_shape)))
             if len(out_shape) < 2:
-                out_shape = list(out_shape) + [1] * (2 - len(out_shape))
+                out_shape.extend([1] * (2 - len(out_shape)))
             taxonomy_op_type = self._map_operator_to_taxonomy(operator)
              
-            # Determine how many rendering instances to create: do not replicate; keep one-to-one with instrumentation
-            render_slices = 1
-            # no-op: we don't split rendering here; instrumentation should provide multiple calls if any
-             
-            created_ids: List[str] = []
-            for r in range(render_slices):
-                node_id = f"op_{i}" if render_slices == 1 else f"op_{i}_r{r}"
-                # For rendering replication by chunks, set shapes to [chunk_size, N, C] -> [chunk_size, C]
-                inputs = [TensorDesc(shape=in_shape, dtype='float32')]
-                outputs = [TensorDesc(shape=out_shape, dtype='float32')]
-                scheduler_node = OperatorNode(
-                    id=node_id,
-                    op_type=taxonomy_op_type,
-                    inputs=inputs,
-                    outputs=outputs,
-                    call_count=1,
-                    metadata={
-                        'flop_count': operator.get_num_ops(),
-                        'memory_bytes': sum(t.bytes() for t in inputs) + sum(t.bytes() for t in outputs),
-                        'hardware_type': map_operator_to_hardware_type(taxonomy_op_type),
-                        'realistic_characteristics': True,
-                        'operator_class': type(operator).__name__,
-                        'input_elements': operator.input_a,
-                        'output_elements': operator.output,
-                        'original_op_type': operator.op_type,
-                        'render_slice_index': None,
-                        'render_slices': None,
-                    }
-                )
-                # Attach MLP details when applicable
+            metadata = {
+                'flop_count': operator.get_num_ops(),
+                # float32 tensors: 4 bytes per element (same as TensorDesc.bytes())
+                'memory_bytes': (math.prod(in_shape) + math.prod(out_shape)) * 4,
+                'hardware_type': map_operator_to_hardware_type(taxonomy_op_type),
+                'realistic_characteristics': True,
+                'operator_class': type(operator).__name__,
+                'input_elements': operator.input_a,
+                'output_elements': operator.output,
+                'original_op_type': operator.op_type,
+                'render_slice_index': None,
+                'render_slices': None,
+            }
+            # Attach MLP details when applicable
+            if isinstance(operator, MLPOperator):
                 try:
-                    from operators.computation_operator import MLPOperator as _MLP
-                    if isinstance(operator, _MLP):
-                        scheduler_node.metadata.update({
-                            'mlp_in_dim': operator.in_dim,
-                            'mlp_num_layers': operator.num_layers,
-                            'mlp_layer_width': operator.layer_width,
-                            'mlp_out_dim': operator.out_dim,
-                            'mlp_skip_connections': list(operator.skip_connections) if operator.skip_connections else [],
-                            'mlp_layer_weight_shapes': operator.get_layer_weight_shapes(),
-                        })
+                    metadata.update({
+                        'mlp_in_dim': operator.in_dim,
+                        'mlp_num_layers': operator.num_layers,
+                        'mlp_layer_width': operator.layer_width,
+                        'mlp_out_dim': operator.out_dim,
+                        'mlp_skip_connections': list(operator.skip_connections) if operator.skip_connections else [],
+                        'mlp_layer_weight_shapes': operator.get_layer_weight_shapes(),
+                    })
                 except Exception:
                     pass
-                scheduler_graph.nodes[node_id] = scheduler_node
-                created_ids.append(node_id)
-            op_idx_to_sched_ids[i] = created_ids
+            node_id = sched_ids[i]
+            scheduler_graph.nodes[node_id] = OperatorNode(
+                id=node_id,
+                op_type=taxonomy_op_type,
+                inputs=[TensorDesc(shape=in_shape, dtype='float32')],
+                outputs=[TensorDesc(shape=out_shape, dtype='float32')],
+                call_count=1,
+                metadata=metadata,
+            )
         
-        # Second pass: wire dependencies
+        # Second pass: wire dependencies (children resolved to indices by identity)
+        id_to_idx = {id(op): i for i, op in enumerate(node_list)}
+        new_edges: List[Tuple[str, str]] = []
         for i, operator in enumerate(node_list):
-            src_ids = op_idx_to_sched_ids.get(i, [])
-            for child in getattr(operator, 'children', []) or []:
-                if child in node_list:
-                    j = node_list.index(child)
-                    dst_ids = op_idx_to_sched_ids.get(j, [])
-                    if not src_ids or not dst_ids:
-                        continue
-                    # If destination has multiple slices, connect to its first slice
-                    dst_id = dst_ids[0]
-                    for src_id in src_ids:
-                        scheduler_graph.edges.append((src_id, dst_id))
-            # No replication; nothing to chain
-            ids = op_idx_to_sched_ids.get(i, [])
-            if ids and len(ids) > 1:
-                for a, b in zip(ids[:-1], ids[1:]):
-                    scheduler_graph.edges.append((a, b))
+            children = getattr(operator, 'children', None)
+            if not children:
+                continue
+            src_id = sched_ids[i]
+            for child in children:
+                j = id_to_idx.get(id(child))
+                if j is not None:
+                    new_edges.append((src_id, sched_ids[j]))
+        scheduler_graph.edges.extend(new_edges)
         
         print(f"   [OK] Converted to Scheduler.IR with {len(scheduler_graph.nodes)} nodes")
         return scheduler_graph
-    
+
+    def fuse_same_type_chains(self, scheduler_graph: SchedulerOperatorGraph, op_types) -> int:
+        """Fuse src→dst chains where both nodes share a taxonomy type in *op_types*.
+
+        Only a private link is folded (src has no other successor, dst no other predecessor) and
+        the two must agree on every dim but the last, so no dependency is added or dropped.
+        The fused node keeps src's id and inputs, takes dst's outputs and outgoing edges, and
+        sums flop counts; src's per-layer MLP fields no longer describe it and are dropped.
+        Returns the number of nodes removed.
+        """
+        op_types = set(op_types)
+        nodes = scheduler_graph.nodes
+        succs: Dict[str, List[str]] = defaultdict(list)
+        preds: Dict[str, List[str]] = defaultdict(list)
+        for src_id, dst_id in scheduler_graph.edges:
+            succs[src_id].append(dst_id)
+            preds[dst_id].append(src_id)
+
+        fused = 0
+        # Worklist over candidate heads; a head keeps absorbing until its chain ends
+        for src_id in [nid for nid, node in nodes.items() if node.op_type in op_types]:
+            src = nodes.get(src_id)
+            if src is None:
+                continue
+            while len(succs[src_id]) == 1:
+                dst_id = succs[src_id][0]
+                dst = nodes.get(dst_id)
+                if dst is None or dst is src or dst.op_type != src.op_type or len(preds[dst_id]) != 1:
+                    break
+                if src.outputs[0].shape[:-1] != dst.inputs[0].shape[:-1]:
+                    break
+                src.outputs = dst.outputs
+                src.metadata = {
+                    **{k: v for k, v in src.metadata.items() if not k.startswith('mlp_')},
+                    'flop_count': src.metadata.get('flop_count', 0) + dst.metadata.get('flop_count', 0),
+                    # The intermediate tensor stays on-chip; count only the fused boundary
+                    'memory_bytes': (math.prod(src.inputs[0].shape) + math.prod(src.outputs[0].shape)) * 4,
+                    'output_elements': dst.metadata.get('output_elements'),
+                    'fused_ops': src.metadata.get('fused_ops', [src_id]) + dst.metadata.get('fused_ops', [dst_id]),
+                }
+                succs[src_id] = succs.pop(dst_id, [])
+                for nxt in succs[src_id]:
+                    preds[nxt] = [src_id if p == dst_id else p for p in preds[nxt]]
+                preds.pop(dst_id, None)
+                del nodes[dst_id]
+                fused += 1
+
+        if fused:
+            scheduler_graph.edges = [(s, d) for s in nodes for d in succs.get(s, ())]
+        return fused
+
     def analyze_transformation_impact(self, original_dag: Dict[str, Any], characteristics: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the transformation impact."""
         original_nodes = len(original_dag.get('nodes', {}))
@@ -992,18 +1197,22 @@ def load_and_transform_traced_dag(dag_path: str) -> Tuple[SchedulerOperatorGraph
     print(f"🚀 Complete DAG Transformation Pipeline")
     print("=" * 50)
     
-    # Load traced DAG
-    with open(dag_path, 'rb') as f:
-        dag_data = pickle.load(f)
+    # Load traced DAG (in-memory graphs are used as-is)
+    if isinstance(dag_path, (str, Path)):
+        with open(dag_path, 'rb') as f:
+            dag_data = pickle.load(f)
+    else:
+        dag_data = dag_path
     
     if isinstance(dag_data, nx.DiGraph):
-        # Convert NetworkX to dict format
-        dict_dag = {"nodes": {}, "edges": list(dag_data.edges())}
-        for node_id, node_data in dag_data.nodes(data=True):
-            node_data_copy = node_data.copy()
-            node_data_copy['function_name'] = str(node_id)
-            dict_dag["nodes"][node_id] = node_data_copy
-        dag_data = dict_dag
+        # Convert NetworkX to dict format in one pass over the adjacency views
+        dag_data = {
+            "nodes": {
+                node_id: {**node_data, 'function_name': str(node_id)}
+                for node_id, node_data in dag_data.nodes(data=True)
+            },
+            "edges": list(dag_data.edges),
+        }
     
     print(f"📥 Loaded traced DAG: {len(dag_data['nodes'])} nodes, {len(dag_data.get('edges', []))} edges")
     
@@ -1018,34 +1227,13 @@ def load_and_transform_traced_dag(dag_path: str) -> Tuple[SchedulerOperatorGraph
     # Optional filters:
     #   RENDERSIM_PLOT_INCLUDE="MLP,Encoding"   (substring match on op_type or class)
     #   RENDERSIM_PLOT_MAX_NODES=200
+    plot_pool = None
+    plot_jobs = []
     try:
         def _should(name: str) -> bool:
             v = os.environ.get(name, "0").strip().lower()
             return v in ("1", "true", "yes", "on")
 
-        include_filter = os.environ.get("RENDERSIM_PLOT_INCLUDE", "").strip()
-        include_terms = [t.strip().lower() for t in include_filter.split(',') if t.strip()] if include_filter else []
-        max_nodes_env = os.environ.get("RENDERSIM_PLOT_MAX_NODES")
-        try:
-            max_nodes = int(max_nodes_env) if max_nodes_env else None
-        except Exception:
-            max_nodes = None
-
-        def _filtered_nodes(all_nodes):
-            nodes = list(all_nodes)
-            if include_terms:
-                def _match(op):
-                    try:
-                        name = getattr(op, 'op_type', '') or type(op).__name__
-                        name = str(name).lower()
-                        return any(term in name for term in include_terms)
-                    except Exception:
-                        return False
-                nodes = [op for op in nodes if _match(op)]
-            if max_nodes is not None and len(nodes) > max_nodes:
-                nodes = nodes[:max_nodes]
-            return nodes
-
         # Default: emit SVG alongside PNG unless user explicitly disabled
         try:
             if os.environ.get("RENDERSIM_PLOT_SVG") in (None, ""):
@@ -1053,22 +1241,66 @@ def load_and_transform_traced_dag(dag_path: str) -> Tuple[SchedulerOperatorGraph
         except Exception:
             pass
 
-        if _should("RENDERSIM_PLOT_OPERATORS"):
+        plot_coarse = _should("RENDERSIM_PLOT_OPERATORS")
+        plot_fine = _should("RENDERSIM_PLOT_FINE_OPERATORS")
+        if plot_coarse or plot_fine:
+            # Rendering shells out to graphviz; let it overlap with the Scheduler.IR conversion
+            plot_pool = ThreadPoolExecutor(max_workers=1)
+        if plot_coarse:
             # Coarse graph is small; no filtering needed
-            operators_graph.plot_graph(title="Operator Graph", save_path="operator_graph.png")
-        if _should("RENDERSIM_PLOT_FINE_OPERATORS"):
+            plot_jobs.append(plot_pool.submit(
+                operators_graph.plot_graph, title="Operator Graph", save_path="operator_graph.png"))
+        if plot_fine:
+            include_filter = os.environ.get("RENDERSIM_PLOT_INCLUDE", "").strip()
+            include_terms = [t.strip().lower() for t in include_filter.split(',') if t.strip()] if include_filter else []
+            max_nodes_env = os.environ.get("RENDERSIM_PLOT_MAX_NODES")
+            try:
+                max_nodes = int(max_nodes_env) if max_nodes_env else None
+            except Exception:
+                max_nodes = None
+
+            def _match(op):
+                try:
+                    name = getattr(op, 'op_type', '') or type(op).__name__
+                    name = str(name).lower()
+                    return any(term in name for term in include_terms)
+                except Exception:
+                    return False
+
+            nodes = list(operators_graph.nodes)
+            if include_terms:
+                nodes = [op for op in nodes if _match(op)]
+            if max_nodes is not None and len(nodes) > max_nodes:
+                nodes = nodes[:max_nodes]
+
             from Operators.utils.operator_graph import FineOperatorGraph
             fine = FineOperatorGraph()
-            fine.nodes.extend(_filtered_nodes(operators_graph.nodes))
-            fine.plot_graph(title="Fine Operator Graph", save_path="operator_graph_fine.png")
+            fine.nodes.extend(nodes)
+            plot_jobs.append(plot_pool.submit(
+                fine.plot_graph, title="Fine Operator Graph", save_path="operator_graph_fine.png"))
     except Exception:
         pass
  
     # Convert to Scheduler.IR
     scheduler_graph = integration.operators_to_scheduler_ir(operators_graph, {})
-    
+
+    # Optional: fuse private same-type chains, e.g. RENDERSIM_FUSE_OPS="ENCODING"
+    fuse_types = [t.strip().upper() for t in os.environ.get("RENDERSIM_FUSE_OPS", "").split(',') if t.strip()]
+    if fuse_types:
+        fused = integration.fuse_same_type_chains(scheduler_graph, fuse_types)
+        print(f"   🔗 Fused {fused} operators into same-type chains ({', '.join(fuse_types)})")
+
     # Analyze impact
     impact = integration.analyze_transformation_impact(dag_data, characteristics)
+
+    # Plots must be on disk before returning; a failed plot never fails the transformation
+    if plot_pool is not None:
+        for job in plot_jobs:
+            try:
+                job.result()
+            except Exception:
+                pass
+        plot_pool.shutdown()
     
     print(f"\n🎉 Transformation Complete!")
     print(f"   {impact['transformation_summary']['nodes_processed']} operators with realistic characteristics")
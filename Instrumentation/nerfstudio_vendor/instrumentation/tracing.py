@@ -4,7 +4,8 @@ import importlib
 import json
 import os
 import re
-from functools import wraps
+from collections import Counter
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import List, Optional
 
@@ -16,7 +17,8 @@ import networkx as nx
 # ----------------------------------------------------------------------------
 
 execution_dag = nx.DiGraph()
-_call_stack: List[str] = []
+# One frame per active traced call: final ids of the traced calls it made so far
+_call_stack: List[List[str]] = []
 _call_counts = {}
 _config_loaded = False
 _INDEX_DUPLICATE_CALLS = False
@@ -34,6 +36,9 @@ _CROSS_STAGE_EDGE_ATTR: str = "stage_transition"
 _ADD_COLOR_DATA_EDGE: bool = True
 _DATA_COLOR_EDGE_ATTR: str = "data_concat"
 _LAST_TRUNK_BY_STAGE: dict[str, str] = {}
+# Latest trunk node per stage over the whole trace (not reset per get_outputs); color calls
+# fall back to it when the current get_outputs has not traced a trunk yet
+_TRUNK_INDEX: dict[str, str] = {}
 _LAST_DENSITY_HEAD_BY_STAGE: dict[str, str] = {}
 _ADD_DENSITY_WEIGHTS_EDGE: bool = True
 _DENSITY_WEIGHTS_EDGE_ATTR: str = "density_to_weights"
@@ -75,15 +80,35 @@ def _load_json_with_comments(path: str) -> dict:
     return json.loads(text)
 
 
+# Formatted shape strings keyed by the (hashable) shape object, e.g. torch.Size.
+# The same few shapes repeat across a forward pass; reset if it ever grows large
+_SHAPE_STR_CACHE: dict = {}
+_SHAPE_STR_CACHE_MAX = 4096
+
+
+def _format_shape(shp) -> str:
+    dims = tuple(shp)
+    return str(dims) if dims else ""
+
+
 def _shape_of(obj) -> Optional[str]:
     try:
-        if hasattr(obj, "shape"):
-            shp = tuple(getattr(obj, "shape"))
-            if len(shp) > 0:
-                return str(shp)
+        shp = getattr(obj, "shape", None)
+        if shp is None:
+            return None
+        try:
+            s = _SHAPE_STR_CACHE[shp]
+        except KeyError:
+            s = _format_shape(shp)
+            if len(_SHAPE_STR_CACHE) >= _SHAPE_STR_CACHE_MAX:
+                _SHAPE_STR_CACHE.clear()
+            _SHAPE_STR_CACHE[shp] = s
+        except TypeError:
+            # Unhashable shape (e.g. a list): format without caching
+            s = _format_shape(shp)
+        return s or None
     except Exception:
-        pass
-    return None
+        return None
 
 
 def _collect_shapes_from(value) -> List[str]:
@@ -93,53 +118,63 @@ def _collect_shapes_from(value) -> List[str]:
     if s:
         shapes.append(s)
         return shapes
-    # Common containers
-    try:
-        if isinstance(value, (list, tuple)):
-            for it in value:
-                if len(shapes) >= 2:
-                    break
-                s = _shape_of(it)
-                if s:
-                    shapes.append(s)
-        elif isinstance(value, dict):
-            for it in value.values():
-                if len(shapes) >= 2:
-                    break
-                s = _shape_of(it)
-                if s:
-                    shapes.append(s)
-    except Exception:
-        pass
+    # Common containers (_shape_of never raises, so no guard is needed here)
+    if isinstance(value, (list, tuple)):
+        items = value
+    elif isinstance(value, dict):
+        items = value.values()
+    else:
+        return shapes
+    for it in items:
+        if len(shapes) >= 2:
+            break
+        s = _shape_of(it)
+        if s:
+            shapes.append(s)
     return shapes
 
 
+@lru_cache(maxsize=4096)
+def _node_id(func_name: str, in_sig: str, out_sig: str) -> str:
+    return f"{func_name}[{in_sig}->{out_sig}]"
+
+
+def _is_trunk_sig(in_sig: str, out_sig: str) -> bool:
+    return (", 63)" in in_sig) and (", 256)" in out_sig)
+
+
+def _is_trunk_mlp(func_name: str, in_sig: str, out_sig: str) -> bool:
+    return func_name.endswith("field_components.mlp.MLP.forward") and _is_trunk_sig(in_sig, out_sig)
+
+
 def _make_node_label(func_name: str, args, kwargs, result) -> tuple[str, str, str]:
+    # Foreign objects are only touched through _shape_of, which handles their errors
     in_shapes = []
-    try:
-        # positional
-        for a in args:
-            in_shapes.extend(_collect_shapes_from(a))
-        # keyword
-        for v in kwargs.values():
-            in_shapes.extend(_collect_shapes_from(v))
-    except Exception:
-        pass
-    out_shapes = []
-    try:
-        if result is None:
-            out_shapes = ["None"]
-        elif isinstance(result, (list, tuple, dict)):
-            out_shapes.extend(_collect_shapes_from(result))
-        else:
-            s = _shape_of(result)
-            out_shapes.append(s if s else "?")
-    except Exception:
-        out_shapes = ["?"]
+    # positional
+    for a in args:
+        in_shapes.extend(_collect_shapes_from(a))
+    # keyword
+    for v in kwargs.values():
+        in_shapes.extend(_collect_shapes_from(v))
+    if result is None:
+        out_shapes = ["None"]
+    elif isinstance(result, (list, tuple, dict)):
+        out_shapes = _collect_shapes_from(result)
+    else:
+        s = _shape_of(result)
+        out_shapes = [s if s else "?"]
     in_sig = ",".join(in_shapes) if in_shapes else "no_tensors"
     out_sig = ",".join([s for s in out_shapes if s]) if out_shapes else "no_tensors"
-    node_id = f"{func_name}[{in_sig}->{out_sig}]"
-    return node_id, in_sig, out_sig
+    return _node_id(func_name, in_sig, out_sig), in_sig, out_sig
+
+
+def _bump_edge(u: str, v: str, attr: str, n: int = 1) -> None:
+    """Add *n* to edge attribute *attr* of u→v, creating the edge if it does not exist."""
+    ed = execution_dag._succ.get(u, {}).get(v)
+    if ed is None:
+        execution_dag.add_edge(u, v, **{attr: n})
+    else:
+        ed[attr] = ed.get(attr, 0) + n
 
 
 # ----------------------------------------------------------------------------
@@ -147,16 +182,30 @@ def _make_node_label(func_name: str, args, kwargs, result) -> tuple[str, str, st
 # ----------------------------------------------------------------------------
 
 def _trace_wrapper(func, fq_name: str):
+    # The wrapped function's name is fixed, so resolve its special roles once here
+    # rather than comparing strings on every call
+    is_get_outputs = fq_name == "nerfstudio.models.vanilla_nerf.NeRFModel.get_outputs"
+    if fq_name == "nerfstudio.model_components.ray_samplers.UniformSampler.generate_ray_samples":
+        starts_stage = "coarse"
+    elif fq_name == "nerfstudio.model_components.ray_samplers.PDFSampler.generate_ray_samples":
+        starts_stage = "fine"
+    else:
+        starts_stage = None
+    is_mlp = fq_name.endswith("field_components.mlp.MLP.forward")
+    is_density_head = fq_name.endswith("field_components.field_heads.DensityFieldHead.forward")
+    is_get_weights = fq_name.endswith("cameras.rays.RaySamples.get_weights")
+
     @wraps(func)
     def _wrapped(*args, **kwargs):
         base = fq_name
-        # Provisional push to capture edges from children
-        _call_stack.append(base)
+        # Children report their final ids here; caller edges are added once ours is known
+        callees: List[str] = []
+        _call_stack.append(callees)
         # Stage management and get_outputs scope tracking
         entered_get_outputs = False
         try:
             global _IN_GET_OUTPUTS_DEPTH, _CURRENT_STAGE, _LAST_NODE_BY_STAGE, _LAST_TRUNK_BY_STAGE
-            if base == "nerfstudio.models.vanilla_nerf.NeRFModel.get_outputs":
+            if is_get_outputs:
                 _IN_GET_OUTPUTS_DEPTH += 1
                 entered_get_outputs = True
                 if _IN_GET_OUTPUTS_DEPTH == 1:
@@ -164,11 +213,8 @@ def _trace_wrapper(func, fq_name: str):
                     _LAST_NODE_BY_STAGE.clear()
                     _LAST_TRUNK_BY_STAGE.clear()
             # Determine stage for this call based on sampler events
-            if _IN_GET_OUTPUTS_DEPTH > 0:
-                if base == "nerfstudio.model_components.ray_samplers.UniformSampler.generate_ray_samples":
-                    _CURRENT_STAGE = "coarse"
-                elif base == "nerfstudio.model_components.ray_samplers.PDFSampler.generate_ray_samples":
-                    _CURRENT_STAGE = "fine"
+            if starts_stage is not None and _IN_GET_OUTPUTS_DEPTH > 0:
+                _CURRENT_STAGE = starts_stage
             # Capture stage at call time for node attribution
             stage_for_this_call = _CURRENT_STAGE if _IN_GET_OUTPUTS_DEPTH > 0 else None
 
@@ -179,14 +225,10 @@ def _trace_wrapper(func, fq_name: str):
                 k = _call_counts.get(node_id, 0) + 1
                 _call_counts[node_id] = k
                 final_id = f"{node_id}#{k}"
-            # Relabel provisional if present
-            try:
-                if base in execution_dag and final_id != base:
-                    nx.relabel_nodes(execution_dag, {base: final_id}, copy=False)
-            except Exception:
-                pass
-            # Create/update node
-            if final_id not in execution_dag:
+            # Create/update node. Repeat calls are the common case, so read networkx's
+            # node dict directly instead of going through the nodes view
+            nd = execution_dag._node.get(final_id)
+            if nd is None:
                 execution_dag.add_node(
                     final_id,
                     func_name=base,
@@ -196,79 +238,59 @@ def _trace_wrapper(func, fq_name: str):
                     count=1,
                 )
             else:
-                nd = execution_dag.nodes[final_id]
                 nd["count"] = int(nd.get("count", 0)) + 1
                 nd.setdefault("func_name", base)
                 nd.setdefault("input_shapes", in_sig)
                 nd.setdefault("output_shapes", out_sig)
-                if stage_for_this_call is not None:
-                    nd.setdefault("stage", stage_for_this_call)
-            # Edge from caller to callee
+                if stage_for_this_call is not None and nd.get("stage") is None:
+                    nd["stage"] = stage_for_this_call
+            # Edges from this call to the traced calls it made; a callee invoked in a loop
+            # is folded into one weight update
+            if callees:
+                for callee, n in Counter(callees).items():
+                    if callee != final_id:
+                        _bump_edge(final_id, callee, "weight", n)
+            # Report this call to its caller
             if len(_call_stack) >= 2:
-                caller = _call_stack[-2]
-                if caller != final_id:
-                    if execution_dag.has_edge(caller, final_id):
-                        execution_dag[caller][final_id]["weight"] = execution_dag[caller][final_id].get("weight", 0) + 1
-                    else:
-                        execution_dag.add_edge(caller, final_id, weight=1)
+                _call_stack[-2].append(final_id)
             # Optional sequence edge within the same stage to capture linear ordering
             if _SEQ_ADD_EDGES and stage_for_this_call:
                 prev = _LAST_NODE_BY_STAGE.get(stage_for_this_call)
                 if prev and prev != final_id:
-                    if execution_dag.has_edge(prev, final_id):
-                        execution_dag[prev][final_id][_SEQ_EDGE_ATTR] = execution_dag[prev][final_id].get(_SEQ_EDGE_ATTR, 0) + 1
-                    else:
-                        execution_dag.add_edge(prev, final_id, **{_SEQ_EDGE_ATTR: 1})
+                    _bump_edge(prev, final_id, _SEQ_EDGE_ATTR)
                 _LAST_NODE_BY_STAGE[stage_for_this_call] = final_id
             # Always track the last node per stage even if sequence edges are not being added
             elif stage_for_this_call:
                 _LAST_NODE_BY_STAGE[stage_for_this_call] = final_id
             # Track trunk MLP (… ,63)->(…,256) per stage
-            try:
-                if stage_for_this_call and base.endswith("field_components.mlp.MLP.forward"):
-                    is_trunk = (", 63)" in in_sig) and (", 256)" in out_sig)
-                    is_color = (", 283)" in in_sig) and (", 128)" in out_sig)
-                    if is_trunk:
-                        _LAST_TRUNK_BY_STAGE[stage_for_this_call] = final_id
-                    # Add trunk→color data edge to explain concat 256+27 → 283
-                    if is_color and _ADD_COLOR_DATA_EDGE:
-                        trunk = _LAST_TRUNK_BY_STAGE.get(stage_for_this_call)
-                        # Fallback: if trunk was not cached (edge case), search the latest trunk node in this stage
-                        if not trunk:
-                            try:
-                                for nid in reversed(list(execution_dag.nodes())):
-                                    nd = execution_dag.nodes[nid]
-                                    if (nd or {}).get("stage") != stage_for_this_call:
-                                        continue
-                                    fn = str((nd or {}).get("func_name", ""))
-                                    ins = str((nd or {}).get("input_shapes", ""))
-                                    outs = str((nd or {}).get("output_shapes", ""))
-                                    if fn.endswith("field_components.mlp.MLP.forward") and (", 63)" in ins) and (", 256)" in outs):
-                                        trunk = nid
-                                        break
-                            except Exception:
-                                pass
-                        if trunk and trunk != final_id:
-                            if execution_dag.has_edge(trunk, final_id):
-                                execution_dag[trunk][final_id][_DATA_COLOR_EDGE_ATTR] = execution_dag[trunk][final_id].get(_DATA_COLOR_EDGE_ATTR, 0) + 1
-                            else:
-                                execution_dag.add_edge(trunk, final_id, **{_DATA_COLOR_EDGE_ATTR: 1})
-                # Track density head and add density→weights data edge
-                if stage_for_this_call and base.endswith("field_components.field_heads.DensityFieldHead.forward"):
-                    _LAST_DENSITY_HEAD_BY_STAGE[stage_for_this_call] = final_id
-                if (
-                    stage_for_this_call
-                    and _ADD_DENSITY_WEIGHTS_EDGE
-                    and base.endswith("cameras.rays.RaySamples.get_weights")
-                ):
-                    dens = _LAST_DENSITY_HEAD_BY_STAGE.get(stage_for_this_call)
-                    if dens and dens != final_id:
-                        if execution_dag.has_edge(dens, final_id):
-                            execution_dag[dens][final_id][_DENSITY_WEIGHTS_EDGE_ATTR] = execution_dag[dens][final_id].get(_DENSITY_WEIGHTS_EDGE_ATTR, 0) + 1
-                        else:
-                            execution_dag.add_edge(dens, final_id, **{_DENSITY_WEIGHTS_EDGE_ATTR: 1})
-            except Exception:
-                pass
+            if stage_for_this_call and is_mlp:
+                is_trunk = _is_trunk_sig(in_sig, out_sig)
+                is_color = (", 283)" in in_sig) and (", 128)" in out_sig)
+                if is_trunk:
+                    _LAST_TRUNK_BY_STAGE[stage_for_this_call] = final_id
+                    _TRUNK_INDEX[stage_for_this_call] = final_id
+                # Add trunk→color data edge to explain concat 256+27 → 283
+                if is_color and _ADD_COLOR_DATA_EDGE:
+                    # Fallback: if trunk was not cached (edge case), use the latest trunk in this stage
+                    trunk = _LAST_TRUNK_BY_STAGE.get(stage_for_this_call)
+                    if not trunk:
+                        trunk = _TRUNK_INDEX.get(stage_for_this_call)
+                        # The DAG may have been cleared since; never revive a node that is gone
+                        if trunk not in execution_dag._node:
+                            trunk = None
+                    if trunk and trunk != final_id:
+                        _bump_edge(trunk, final_id, _DATA_COLOR_EDGE_ATTR)
+            # Track density head and add density→weights data edge
+            if stage_for_this_call and is_density_head:
+                _LAST_DENSITY_HEAD_BY_STAGE[stage_for_this_call] = final_id
+            if (
+                stage_for_this_call
+                and _ADD_DENSITY_WEIGHTS_EDGE
+                and is_get_weights
+            ):
+                dens = _LAST_DENSITY_HEAD_BY_STAGE.get(stage_for_this_call)
+                if dens and dens != final_id:
+                    _bump_edge(dens, final_id, _DENSITY_WEIGHTS_EDGE_ATTR)
             # Optional cross-stage edge: link last coarse to first fine within current get_outputs
             if (
                 _CROSS_STAGE_ADD_EDGE
@@ -277,10 +299,7 @@ def _trace_wrapper(func, fq_name: str):
             ):
                 coarse_last = _LAST_NODE_BY_STAGE.get("coarse")
                 if coarse_last and coarse_last != final_id:
-                    if execution_dag.has_edge(coarse_last, final_id):
-                        execution_dag[coarse_last][final_id][_CROSS_STAGE_EDGE_ATTR] = execution_dag[coarse_last][final_id].get(_CROSS_STAGE_EDGE_ATTR, 0) + 1
-                    else:
-                        execution_dag.add_edge(coarse_last, final_id, **{_CROSS_STAGE_EDGE_ATTR: 1})
+                    _bump_edge(coarse_last, final_id, _CROSS_STAGE_EDGE_ATTR)
             return result
         finally:
             if _call_stack:
@@ -379,7 +398,7 @@ def load_trace_config(config_path: str, unique_calls: bool = False) -> None:
 
     functions = list(cfg.get("functions_to_trace", []))
     # Clear previous
-    execution_dag.clear()
+    reset_trace()
     _call_stack.clear()
     _call_counts.clear()
     # Apply wrappers
@@ -402,6 +421,15 @@ def load_trace_config(config_path: str, unique_calls: bool = False) -> None:
     _config_loaded = True
 
 
+def reset_trace() -> None:
+    """Empty the global execution_dag along with the indexes that refer to its nodes.
+
+    Use this instead of ``execution_dag.clear()`` when starting a fresh trace.
+    """
+    execution_dag.clear()
+    _TRUNK_INDEX.clear()
+
+
 def save_dag(filename: str) -> None:
     try:
         p = Path(filename)
@@ -409,7 +437,7 @@ def save_dag(filename: str) -> None:
         import pickle
         with p.open("wb") as f:
             import copy
-            pickle.dump(copy.deepcopy(execution_dag), f)
+            pickle.dump(copy.deepcopy(execution_dag), f, protocol=5)
         print(f"[Tracing] DAG saved to {p}")
     except Exception as e:
         print(f"[Tracing] Failed to save DAG: {e}")
@@ -424,14 +452,19 @@ def load_dag(filename: str) -> None:
             g = pickle.load(f)
         if isinstance(g, nx.DiGraph):
             # Replace in place to preserve references
-            execution_dag.clear()
+            reset_trace()
             execution_dag.add_nodes_from(g.nodes(data=True))
             execution_dag.add_edges_from(g.edges(data=True))
         else:
             # Convert to DiGraph if needed
-            execution_dag.clear()
+            reset_trace()
             execution_dag.add_nodes_from(g.nodes(data=True))
             execution_dag.add_edges_from(g.edges(data=True))
+        # Re-index trunk nodes of the loaded graph (latest per stage wins)
+        for nid, nd in execution_dag.nodes(data=True):
+            st = nd.get("stage")
+            if st and _is_trunk_mlp(str(nd.get("func_name", "")), str(nd.get("input_shapes", "")), str(nd.get("output_shapes", ""))):
+                _TRUNK_INDEX[st] = nid
         print(f"[Tracing] DAG loaded from {p}")
     except Exception as e:
         print(f"[Tracing] Failed to load DAG: {e}")
@@ -73,8 +73,8 @@ class TrainingTracer:
         self.current_iteration = iteration
         self.is_tracing = True
         
-        # Clear previous DAG
-        self.tracing_module.execution_dag.clear()
+        # Clear previous DAG (and the tracer's indexes into it)
+        self.tracing_module.reset_trace()
         CONSOLE.log(f"[cyan]Started tracing iteration {iteration}[/cyan]")
     
     def end_iteration(self):
@@ -93,7 +93,7 @@ class TrainingTracer:
         # Save to file
         trace_file = self.output_dir / f"execution_dag_iter_{iteration}.pkl"
         with open(trace_file, 'wb') as f:
-            pickle.dump(dag, f)
+            pickle.dump(dag, f, protocol=5)
         
         CONSOLE.log(f"[green]Saved trace for iteration {iteration} to {trace_file}[/green]")
         CONSOLE.log(f"  - Nodes: {dag.number_of_nodes()}, Edges: {dag.number_of_edges()}")
@@ -114,7 +114,7 @@ class TrainingTracer:
         }
         
         with open(summary_file, 'wb') as f:
-            pickle.dump(summary, f)
+            pickle.dump(summary, f, protocol=5)
         
         CONSOLE.log(f"[green]Saved training trace summary to {summary_file}[/green]")
         CONSOLE.log(f"  - Total iterations traced: {len(self.iteration_traces)}")
@@ -3,6 +3,7 @@
 #include <unordered_set>
 #include <algorithm>
 #include <cmath>
+#include <functional>
 
 namespace rendersim {
 
@@ -70,9 +71,9 @@ private:
         }
         
         // Priority queue for ready operations (prioritize by critical path)
+        const auto critical_paths = computeCriticalPaths(op_scheduled_ir);
         auto priority_comp = [&](const std::string& a, const std::string& b) {
-            return computeCriticalPath(a, op_scheduled_ir) < 
-                   computeCriticalPath(b, op_scheduled_ir);
+            return critical_paths.at(a) < critical_paths.at(b);
         };
         std::priority_queue<std::string, std::vector<std::string>, 
                           decltype(priority_comp)> ready_queue(priority_comp);
@@ -146,23 +147,38 @@ private:
         return schedule;
     }
     
-    int computeCriticalPath(const std::string& op, 
-                           const OperatorScheduledIR& op_scheduled_ir) {
-        // Compute critical path length from this operation
-        // This is a simplified version - full implementation would use dynamic programming
-        const auto& node = op_scheduled_ir.nodes.at(op);
-        int path_length = node.duration;
-        
-        // Find longest path through successors
-        int max_successor_path = 0;
+    std::unordered_map<std::string, int> computeCriticalPaths(
+        const OperatorScheduledIR& op_scheduled_ir) {
+        // Critical path length from every operation, computed once per phase:
+        // each node's longest path is memoized so shared successors are not re-walked
+        std::unordered_map<std::string, std::vector<std::string>> successors;
         for (const auto& edge : op_scheduled_ir.edges) {
-            if (edge.first == op) {
-                int successor_path = computeCriticalPath(edge.second, op_scheduled_ir);
-                max_successor_path = std::max(max_successor_path, successor_path);
-            }
+            successors[edge.first].push_back(edge.second);
         }
         
-        return path_length + max_successor_path;
+        std::unordered_map<std::string, int> path_lengths;
+        path_lengths.reserve(op_scheduled_ir.nodes.size());
+        std::function<int(const std::string&)> visit = [&](const std::string& op) -> int {
+            auto it = path_lengths.find(op);
+            if (it != path_lengths.end()) {
+                return it->second;
+            }
+            int max_successor_path = 0;
+            auto succ_it = successors.find(op);
+            if (succ_it != successors.end()) {
+                for (const auto& successor : succ_it->second) {
+                    max_successor_path = std::max(max_successor_path, visit(successor));
+                }
+            }
+            int path_length = op_scheduled_ir.nodes.at(op).duration + max_successor_path;
+            path_lengths[op] = path_length;
+            return path_length;
+        };
+        
+        for (const auto& [id, node] : op_scheduled_ir.nodes) {
+            visit(id);
+        }
+        return path_lengths;
     }
     
     void computeTrainingMetrics(SystemSchedule& schedule, 
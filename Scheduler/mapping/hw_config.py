@@ -7,9 +7,15 @@ Updated to handle the actual hardware configuration format used in examples/hard
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Any
+import functools
 import json
 
-__all__ = ["HWUnit", "HWConfig", "load_hw_config"]
+try:
+    import orjson  # optional: C-accelerated JSON parser
+except ImportError:
+    orjson = None
+
+__all__ = ["HWUnit", "HWConfig", "load_hw_config", "load_hw_config_json", "load_json_file"]
 
 
 @dataclass
@@ -37,11 +43,36 @@ class HWConfig:
         return d
 
 
+def load_json_file(path: str | Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity literals, which only the stdlib parser accepts
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    return load_json_file(path)
+
+
+def load_hw_config_json(path: str | Path) -> Dict[str, Any]:
+    """Return the parsed JSON document of a hardware configuration file.
+
+    Documents are cached per file (keyed on path, mtime and size), so the map and
+    schedule stages share one parse per process. Treat the result as read-only.
+    """
+    path = Path(path).resolve()
+    st = path.stat()
+    return _read_json_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
 def load_hw_config(path: str | Path) -> HWConfig:
     """Load hardware configuration from the actual format used in examples/hardware_configs/"""
-    path = Path(path)
-    with path.open() as f:
-        data = json.load(f)
+    data = load_hw_config_json(path)
     
     # Handle the new format with hardware_modules
     units = []
@@ -35,10 +35,14 @@ def _extract_node_attrs(gx_node_attrs: Dict[str, Any]) -> OperatorNode:
     )
 
 
-def load_execution_dag(pkl_path: str | Path) -> OperatorGraph:
-    pkl_path = Path(pkl_path)
-    with pkl_path.open("rb") as f:
-        dag: nx.DiGraph = pickle.load(f)  # noqa: S301
+def load_execution_dag(pkl_path: str | Path | nx.DiGraph) -> OperatorGraph:
+    if isinstance(pkl_path, nx.DiGraph):
+        # In-memory handoff: graph was built by the caller, skip the pickle round-trip
+        dag = pkl_path
+    else:
+        pkl_path = Path(pkl_path)
+        with pkl_path.open("rb") as f:
+            dag = pickle.load(f)  # noqa: S301
 
     op_graph = OperatorGraph()
     # the nodes may not have stable ids; create sequential ids
@@ -34,7 +34,7 @@ def load_execution_dag_with_operators(dag_path: str) -> OperatorGraph:
     3. Converting to Scheduler.IR format with realistic characteristics
     
     Args:
-        dag_path: Path to the execution DAG pickle file
+        dag_path: Path to the execution DAG pickle file, or an already-loaded DAG
         
     Returns:
         OperatorGraph with realistic operator characteristics from /Operators framework
@@ -61,16 +61,19 @@ def load_execution_dag_enhanced(dag_path: str) -> OperatorGraph:
     Load execution DAG from pickle file with enhanced operator type classification.
     
     Args:
-        dag_path: Path to the execution DAG pickle file
+        dag_path: Path to the execution DAG pickle file, or an already-loaded DAG
         
     Returns:
         OperatorGraph with properly classified operator types
     """
     print(f"Loading enhanced DAG from: {dag_path}")
     
-    # Load raw DAG data
-    with open(dag_path, 'rb') as f:
-        dag_data = pickle.load(f)
+    # Load raw DAG data (in-memory graphs are used as-is)
+    if isinstance(dag_path, (str, Path)):
+        with open(dag_path, 'rb') as f:
+            dag_data = pickle.load(f)
+    else:
+        dag_data = dag_path
     
     if isinstance(dag_data, nx.DiGraph):
         # Convert NetworkX graph to our format
@@ -296,7 +296,7 @@ def convert_legacy_to_semantic(legacy_dag_path: str, semantic_dag_path: str = No
     
     # Save semantic DAG
     with open(semantic_dag_path, 'wb') as f:
-        pickle.dump(semantic_data, f)
+        pickle.dump(semantic_data, f, protocol=5)
     
     print(f"Converted {len(legacy_nodes)} legacy nodes to {len(semantic_nodes)} semantic nodes")
     print(f"Semantic stages: {dict(stage_counters)}")
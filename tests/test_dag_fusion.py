@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for same-type chain fusion on the Scheduler.IR graph
+
+Covers DAGToOperatorsIntegration.fuse_same_type_chains and the
+RENDERSIM_FUSE_OPS gate in load_and_transform_traced_dag.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add RenderSim to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Operators/ (imported by the integration module) needs torch, and its graph plotting graphviz
+pytest.importorskip("torch")
+pytest.importorskip("graphviz")
+
+from Instrumentation import dag_to_operators_integration as integration_module
+from Instrumentation.dag_to_operators_integration import DAGToOperatorsIntegration
+from Scheduler.IR import OperatorGraph, OperatorNode, TensorDesc
+
+
+def _node(node_id, op_type, in_shape, out_shape, flops=10, **metadata):
+    metadata = {
+        'flop_count': flops,
+        'input_elements': in_shape[0] * in_shape[1],
+        'output_elements': out_shape[0] * out_shape[1],
+        **metadata,
+    }
+    return OperatorNode(
+        id=node_id,
+        op_type=op_type,
+        inputs=[TensorDesc(shape=list(in_shape))],
+        outputs=[TensorDesc(shape=list(out_shape))],
+        metadata=metadata,
+    )
+
+
+def _graph(nodes, edges):
+    return OperatorGraph(nodes={n.id: n for n in nodes}, edges=list(edges))
+
+
+def _encoding_chain(order=("a", "b", "c")):
+    """a -> b -> c, all ENCODING, with node insertion in the given order"""
+    nodes = {
+        "a": _node("a", "ENCODING", (64, 3), (64, 32), flops=1),
+        "b": _node("b", "ENCODING", (64, 32), (64, 16), flops=2),
+        "c": _node("c", "ENCODING", (64, 16), (64, 8), flops=4),
+    }
+    return _graph([nodes[n] for n in order], [("a", "b"), ("b", "c")])
+
+
+def test_linear_chain_is_fused():
+    graph = _encoding_chain()
+
+    assert DAGToOperatorsIntegration().fuse_same_type_chains(graph, ["ENCODING"]) == 2
+    assert list(graph.nodes) == ["a"]
+    assert graph.edges == []
+
+    fused = graph.nodes["a"]
+    assert fused.inputs[0].shape == [64, 3]
+    assert fused.outputs[0].shape == [64, 8]
+    assert fused.metadata['flop_count'] == 7
+    assert fused.metadata['fused_ops'] == ["a", "b", "c"]
+    assert fused.metadata['input_elements'] == 64 * 3
+    assert fused.metadata['output_elements'] == 64 * 8
+    assert fused.metadata['memory_bytes'] == (64 * 3 + 64 * 8) * 4
+
+
+def test_head_listed_after_tail():
+    graph = _encoding_chain(order=("c", "b", "a"))
+
+    assert DAGToOperatorsIntegration().fuse_same_type_chains(graph, ["ENCODING"]) == 2
+    assert list(graph.nodes) == ["a"]
+    assert graph.nodes["a"].metadata['fused_ops'] == ["a", "b", "c"]
+    assert graph.nodes["a"].outputs[0].shape == [64, 8]
+
+
+def test_fan_in_and_fan_out_are_not_fused():
+    # x fans out to y and z; y and z fan in to w
+    graph = _graph(
+        [
+            _node("x", "ENCODING", (64, 3), (64, 32)),
+            _node("y", "ENCODING", (64, 32), (64, 32)),
+            _node("z", "ENCODING", (64, 32), (64, 32)),
+            _node("w", "ENCODING", (64, 32), (64, 8)),
+        ],
+        [("x", "y"), ("x", "z"), ("y", "w"), ("z", "w")],
+    )
+
+    assert DAGToOperatorsIntegration().fuse_same_type_chains(graph, ["ENCODING"]) == 0
+    assert set(graph.nodes) == {"x", "y", "z", "w"}
+    assert sorted(graph.edges) == [("x", "y"), ("x", "z"), ("y", "w"), ("z", "w")]
+
+
+def test_other_types_and_mlp_fields():
+    graph = _graph(
+        [
+            _node("enc", "ENCODING", (64, 3), (64, 32)),
+            _node("mlp0", "FIELD_COMPUTATION", (64, 32), (64, 64), mlp_in_dim=32, mlp_out_dim=64),
+            _node("mlp1", "FIELD_COMPUTATION", (64, 64), (64, 4), mlp_in_dim=64, mlp_out_dim=4),
+        ],
+        [("enc", "mlp0"), ("mlp0", "mlp1")],
+    )
+
+    assert DAGToOperatorsIntegration().fuse_same_type_chains(graph, ["FIELD_COMPUTATION"]) == 1
+    assert graph.edges == [("enc", "mlp0")]
+    # Per-layer MLP fields of the head no longer describe the fused node
+    assert not any(key.startswith('mlp_') for key in graph.nodes["mlp0"].metadata)
+
+
+def test_fuse_ops_env_gate(monkeypatch):
+    characteristics = {
+        'realistic_operators': [],
+        'total_flops': 0,
+        'total_memory_bytes': 0,
+        'operator_types': {},
+    }
+    monkeypatch.setattr(DAGToOperatorsIntegration, 'transform_dag_to_operators',
+                        lambda self, dag_data: (None, characteristics))
+    monkeypatch.setattr(DAGToOperatorsIntegration, 'operators_to_scheduler_ir',
+                        lambda self, operators_graph, hw: _encoding_chain())
+    for name in ("RENDERSIM_PLOT_OPERATORS", "RENDERSIM_PLOT_FINE_OPERATORS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("RENDERSIM_PLOT_SVG", "0")  # otherwise the pipeline defaults it in os.environ
+    dag = {"nodes": {}, "edges": []}
+
+    monkeypatch.delenv("RENDERSIM_FUSE_OPS", raising=False)
+    graph, _ = integration_module.load_and_transform_traced_dag(dag)
+    assert set(graph.nodes) == {"a", "b", "c"}
+
+    monkeypatch.setenv("RENDERSIM_FUSE_OPS", " encoding, blending ")
+    graph, _ = integration_module.load_and_transform_traced_dag(dag)
+    assert list(graph.nodes) == ["a"]
@@ -24,7 +24,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from Scheduler.mapping import MappingEngine
-    from Scheduler.mapping.hw_config import HWUnit, HWConfig, load_hw_config
+    from Scheduler.mapping.hw_config import HWUnit, HWConfig, load_hw_config, load_hw_config_json
     from Scheduler.IR import OperatorNode, OperatorGraph, TensorDesc, MappedIR
 except ImportError:
     print("❌ Failed to import MappingEngine modules")
@@ -76,6 +76,26 @@ class TestHWConfigLoading:
         finally:
             os.unlink(temp_path)
     
+    def test_hw_config_json_cache(self):
+        """Test that parsed configs are reused and refreshed when the file changes"""
+        with NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({"accelerator_name": "A", "hw_units": []}, f)
+            temp_path = f.name
+        
+        try:
+            first = load_hw_config_json(temp_path)
+            assert load_hw_config_json(temp_path) is first
+            
+            with open(temp_path, 'w') as f:
+                json.dump({"accelerator_name": "Changed", "hw_units": []}, f)
+            st = os.stat(temp_path)
+            os.utime(temp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            
+            assert load_hw_config(temp_path).accelerator_name == "Changed"
+            
+        finally:
+            os.unlink(temp_path)
+    
     def test_hw_config_units_by_type(self):
         """Test the units_by_type grouping functionality"""
         units = [